@@ -0,0 +1,37 @@
+"""004 – Add sync_state for the Keka → PostgreSQL migration scripts.
+
+One row per synced entity records the fingerprint of the SQLite data last
+loaded into PostgreSQL and how many rows it produced, so
+scripts/migrate_remaining.py can skip an unchanged reload.
+
+Uses CREATE TABLE IF NOT EXISTS so the migration is safe to run even
+if the table was manually created by an earlier version of the script.
+
+Revision ID: 004_add_sync_state
+Revises: 003_add_salary_helpdesk_expenses_fnf
+Create Date: 2026-10-17 12:00:00.000000+05:30
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers
+revision = "004_add_sync_state"
+down_revision = "003_add_salary_helpdesk_expenses_fnf"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+            entity      VARCHAR(100) PRIMARY KEY,
+            source_hash TEXT NOT NULL,
+            rows        INTEGER NOT NULL,
+            updated_at  TIMESTAMPTZ DEFAULT NOW()
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute(sa.text('DROP TABLE IF EXISTS "sync_state"'))
@@ -15,7 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from backend.auth.models import UserSession
-from backend.common.constants import PERMISSIONS, UserRole
+from backend.common.constants import PERMISSION_SETS, UserRole
 from backend.common.exceptions import ForbiddenException
 from backend.config import settings
 from backend.core_hr.models import Employee
@@ -30,7 +30,8 @@ _ROLE_HIERARCHY: dict[UserRole, set[UserRole]] = {
 }
 
 
-def _hash_token(token: str) -> str:
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest used as the session lookup key."""
     return hashlib.sha256(token.encode()).hexdigest()
 
 
@@ -67,7 +68,7 @@ async def get_current_user(
         raise HTTPException(status_code=401, detail="Invalid token type.")
 
     # Verify session exists, not revoked, not expired
-    token_hash = _hash_token(token)
+    token_hash = hash_token(token)
     result = await db.execute(
         select(UserSession).where(
             UserSession.token_hash == token_hash,
@@ -138,8 +139,7 @@ def require_permission(permission: str) -> Callable:
         employee: Employee = Depends(get_current_user),
     ) -> Employee:
         user_role: UserRole = request.state.user_role
-        role_permissions = PERMISSIONS.get(user_role, [])
-        if permission not in role_permissions:
+        if permission not in PERMISSION_SETS.get(user_role, frozenset()):
             raise ForbiddenException(
                 detail=f"Permission '{permission}' is not granted to role '{user_role.value}'.",
             )
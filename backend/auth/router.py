@@ -1,7 +1,6 @@
 """Auth router — Google OAuth, token refresh, logout, current user profile."""
 
 
-import hashlib
 import uuid
 
 from fastapi import APIRouter, Depends, Request
@@ -9,7 +8,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from backend.auth.dependencies import get_current_user
+from backend.auth.dependencies import get_current_user, hash_token
 from backend.auth.schemas import (
     GoogleAuthRequest,
     MeResponse,
@@ -152,7 +151,7 @@ async def logout(
 ):
     auth_header = request.headers.get("Authorization", "")
     token = auth_header.removeprefix("Bearer ")
-    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    token_hash = hash_token(token)
     await revoke_session(db, token_hash)
 
     # Audit trail
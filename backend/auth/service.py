@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import hashlib
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
@@ -12,6 +11,7 @@ from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.auth.dependencies import hash_token
 from backend.auth.models import RoleAssignment, UserSession
 from backend.common.constants import UserRole
 from backend.common.exceptions import ForbiddenException, NotFoundException
@@ -117,10 +117,6 @@ async def get_highest_role(db: AsyncSession, employee_id: uuid.UUID) -> UserRole
 
 # ── JWT helpers ─────────────────────────────────────────────────────
 
-def _hash_token(token: str) -> str:
-    return hashlib.sha256(token.encode()).hexdigest()
-
-
 def _create_access_token(employee_id: uuid.UUID, role: UserRole) -> tuple[str, int]:
     """Return (encoded_jwt, expires_in_seconds)."""
     expires_in = settings.JWT_EXPIRY_HOURS * 3600
@@ -159,8 +155,8 @@ async def find_or_create_session(
 
     session = UserSession(
         employee_id=employee.id,
-        token_hash=_hash_token(access_token),
-        refresh_token_hash=_hash_token(refresh_token),
+        token_hash=hash_token(access_token),
+        refresh_token_hash=hash_token(refresh_token),
         ip_address=ip,
         user_agent=user_agent,
         expires_at=datetime.now(timezone.utc) + timedelta(hours=settings.JWT_EXPIRY_HOURS),
@@ -198,7 +194,7 @@ async def refresh_access_token(
         raise ForbiddenException(detail="Invalid token type.")
 
     # Look up the session by refresh token hash
-    refresh_hash = _hash_token(refresh_token_str)
+    refresh_hash = hash_token(refresh_token_str)
     result = await db.execute(
         select(UserSession).where(
             UserSession.refresh_token_hash == refresh_hash,
@@ -232,8 +228,8 @@ async def refresh_access_token(
     # Persist new session with both token hashes
     new_session = UserSession(
         employee_id=employee.id,
-        token_hash=_hash_token(access_token),
-        refresh_token_hash=_hash_token(new_refresh_token),
+        token_hash=hash_token(access_token),
+        refresh_token_hash=hash_token(new_refresh_token),
         expires_at=datetime.now(timezone.utc) + timedelta(hours=settings.JWT_EXPIRY_HOURS),
     )
     db.add(new_session)
@@ -5,6 +5,7 @@ from backend.common.constants import (
     DATE_FORMAT,
     DEFAULT_PAGE_SIZE,
     MAX_PAGE_SIZE,
+    PERMISSION_SETS,
     PERMISSIONS,
     TIMEZONE,
     ArrivalStatus,
@@ -54,6 +55,7 @@ __all__ = [
     "RegularizationStatus",
     "UserRole",
     "PERMISSIONS",
+    "PERMISSION_SETS",
     "DATE_FORMAT",
     "TIMEZONE",
     "DEFAULT_PAGE_SIZE",
@@ -165,6 +165,11 @@ PERMISSIONS: dict[UserRole, list[str]] = {
     ],
 }
 
+# Same grants as frozensets, for O(1) membership checks in RBAC
+PERMISSION_SETS: dict[UserRole, frozenset[str]] = {
+    role: frozenset(perms) for role, perms in PERMISSIONS.items()
+}
+
 # ── Misc constants ──────────────────────────────────────────────────
 
 DATE_FORMAT = "%d-%b-%Y"          # Indian format: 19-Feb-2026
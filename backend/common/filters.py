@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
 from typing import Any, Optional, Sequence
 
 from sqlalchemy import Select, String, and_, cast, func, or_, text
@@ -59,41 +61,63 @@ def apply_filters(
 
     ``None`` values are silently skipped.
     """
-    conditions: list = []
+    conditions = [
+        op(col, filters[key])
+        for key, col, op in _compile_filters(model, tuple(filters))
+        if filters[key] is not None
+    ]
 
-    for key, value in filters.items():
-        if value is None:
-            continue
+    if conditions:
+        query = query.where(and_(*conditions))
 
-        if key.endswith("__ilike"):
-            col = _get_column(model, key.removesuffix("__ilike"))
-            if col is not None:
-                conditions.append(col.ilike(f"%{value}%"))
+    return query
 
-        elif key.endswith("__from"):
-            col = _get_column(model, key.removesuffix("__from"))
-            if col is not None:
-                conditions.append(col >= value)
 
-        elif key.endswith("__to"):
-            col = _get_column(model, key.removesuffix("__to"))
-            if col is not None:
-                conditions.append(col <= value)
+def _op_ilike(col: Any, value: Any) -> Any:
+    return col.ilike(f"%{value}%")
 
-        elif key.endswith("__in"):
-            col = _get_column(model, key.removesuffix("__in"))
-            if col is not None:
-                conditions.append(col.in_(value))
 
-        else:
-            col = _get_column(model, key)
-            if col is not None:
-                conditions.append(col == value)
+def _op_from(col: Any, value: Any) -> Any:
+    return col >= value
 
-    if conditions:
-        query = query.where(and_(*conditions))
 
-    return query
+def _op_to(col: Any, value: Any) -> Any:
+    return col <= value
+
+
+def _op_in(col: Any, value: Any) -> Any:
+    return col.in_(value)
+
+
+def _op_eq(col: Any, value: Any) -> Any:
+    return col == value
+
+
+_SUFFIX_OPS: tuple[tuple[str, Callable[[Any, Any], Any]], ...] = (
+    ("__ilike", _op_ilike),
+    ("__from", _op_from),
+    ("__to", _op_to),
+    ("__in", _op_in),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_filters(
+    model: Any,
+    keys: tuple[str, ...],
+) -> tuple[tuple[str, InstrumentedAttribute, Callable[[Any, Any], Any]], ...]:
+    """Resolve filter keys to ``(key, column, operator)`` once per model/key set.
+
+    Keys naming no mapped column are dropped, so they are silently ignored.
+    """
+    plan = []
+    for key in keys:
+        suffix, op = next(((s, f) for s, f in _SUFFIX_OPS if key.endswith(s)), ("", _op_eq))
+        name = key.removesuffix(suffix)
+        col = _get_column(model, name)
+        if col is not None:
+            plan.append((key, col, op))
+    return tuple(plan)
 
 
 # ── Full-text / trigram search ──────────────────────────────────────
@@ -139,6 +163,7 @@ def apply_search(
 
 # ── Internal helper ─────────────────────────────────────────────────
 
+@functools.lru_cache(maxsize=1024)
 def _get_column(model: Any, name: str) -> Optional[InstrumentedAttribute]:
-    """Safely retrieve a mapped column attribute by name."""
+    """Safely retrieve a mapped column attribute by name (memoised per model/name)."""
     return getattr(model, name, None)
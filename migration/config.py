@@ -41,7 +41,7 @@ def get_sqlite_conn() -> sqlite3.Connection:
     """Return a sqlite3 connection with row factory enabled."""
     if not SQLITE_PATH:
         raise FileNotFoundError("Keka SQLite database not found")
-    conn = sqlite3.connect(SQLITE_PATH)
+    conn = sqlite3.connect(SQLITE_PATH, timeout=30)
     conn.row_factory = sqlite3.Row
     return conn
 
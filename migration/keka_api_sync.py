@@ -15,15 +15,18 @@ Requires:
 """
 
 import argparse
+import hashlib
 import json
 import logging
 import os
 import sqlite3
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from dotenv import load_dotenv
@@ -38,6 +41,8 @@ for env_path in [PROJECT_ROOT / ".env", WORKSPACE_ROOT / ".env"]:
         load_dotenv(env_path)
 
 from migration.config import SQLITE_PATH, get_sqlite_conn
+from migration.keka_pages import page_records, total_pages
+from migration.token_cache import TOKEN_CACHE, save_token_cache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,14 +52,18 @@ logger = logging.getLogger("keka_sync")
 
 IST = timezone(timedelta(hours=5, minutes=30))
 
-# ── Token cache ───────────────────────────────────────────────────────
-TOKEN_CACHE = Path(__file__).resolve().parent / ".keka_token_cache.json"
+class KekaRateLimitError(RuntimeError):
+    """Keka kept answering 429/503 after every retry."""
 
 
 class KekaApiSyncer:
     """Sync all Keka API data into SQLite."""
 
     TOKEN_URL = "https://login.keka.com/connect/token"
+    # Entity syncs run on this many threads; the shared rate limiter
+    # keeps the combined request rate inside Keka's budget.
+    ENTITY_WORKERS = 4
+    PAGE_WORKERS = 4
 
     def __init__(self, sqlite_path: str = None):
         self.api_key = os.getenv("KEKA_API_KEY", "")
@@ -66,7 +75,14 @@ class KekaApiSyncer:
         self._token: Optional[str] = None
         self._token_expires: float = 0
         self._request_count = 0
-        self._minute_start = time.time()
+        self._minute_start = time.monotonic()
+        self._rate_lock = threading.Lock()
+        self._auth_lock = threading.Lock()
+        # AIMD cap on in-flight requests: halved on 429/503, grows back by
+        # roughly one slot per window of successful calls.
+        self._max_inflight = float(self.ENTITY_WORKERS)
+        self._inflight = 0
+        self._inflight_cv = threading.Condition()
 
         self.session = requests.Session()
         self.session.headers.update({
@@ -97,11 +113,11 @@ class KekaApiSyncer:
                 pass
 
     def _save_cached_token(self):
-        TOKEN_CACHE.write_text(json.dumps({
+        save_token_cache({
             "access_token": self._token,
             "expires_at": self._token_expires,
             "cached_at": datetime.now().isoformat(),
-        }))
+        })
 
     def authenticate(self):
         """OAuth2 authentication with Keka API."""
@@ -139,85 +155,146 @@ class KekaApiSyncer:
         logger.info("Authenticated successfully")
 
     def _ensure_auth(self):
-        if not self._token or time.time() >= self._token_expires:
-            self.authenticate()
+        with self._auth_lock:
+            if not self._token or time.time() >= self._token_expires:
+                self.authenticate()
+
+    def _reauthenticate(self, stale: Optional[str]):
+        """Refresh after a 401 unless another worker already replaced ``stale``."""
+        with self._auth_lock:
+            if self._token == stale:
+                self.authenticate()
 
     # ── Rate limiting ─────────────────────────────────────────────────
 
     def _rate_limit(self):
         """Enforce 50 calls/minute rate limit."""
-        now = time.time()
-        if now - self._minute_start >= 60:
-            self._request_count = 0
-            self._minute_start = now
-
-        if self._request_count >= 48:  # leave 2-call buffer
-            wait = 60 - (now - self._minute_start) + 1
-            if wait > 0:
-                logger.info("Rate limit: waiting %.1fs", wait)
-                time.sleep(wait)
-            self._request_count = 0
-            self._minute_start = time.time()
-
-        self._request_count += 1
-        time.sleep(0.5)  # min 500ms between requests
+        # Held across the sleeps so concurrent entity syncs share one budget
+        with self._rate_lock:
+            now = time.monotonic()
+            if now - self._minute_start >= 60:
+                self._request_count = 0
+                self._minute_start = now
+
+            if self._request_count >= 48:  # leave 2-call buffer
+                wait = 60 - (now - self._minute_start) + 1
+                if wait > 0:
+                    logger.info("Rate limit: waiting %.1fs", wait)
+                    time.sleep(wait)
+                self._request_count = 0
+                self._minute_start = time.monotonic()
+
+            self._request_count += 1
+            time.sleep(0.5)  # min 500ms between requests
+
+    def _acquire_slot(self):
+        with self._inflight_cv:
+            while self._inflight >= int(self._max_inflight):
+                self._inflight_cv.wait()
+            self._inflight += 1
+
+    def _release_slot(self, overloaded: bool):
+        with self._inflight_cv:
+            self._inflight -= 1
+            if overloaded:
+                self._max_inflight = max(1.0, self._max_inflight / 2)
+            else:
+                self._max_inflight = min(float(self.ENTITY_WORKERS),
+                                         self._max_inflight + 1 / self._max_inflight)
+            self._inflight_cv.notify_all()
 
     # ── HTTP ──────────────────────────────────────────────────────────
 
     def _get(self, path: str, params: Dict = None, retries: int = 3) -> Any:
         """GET with retry and rate limiting."""
+        return self._request(path, params, retries)[1]
+
+    def _get_conditional(self, path: str, params: Dict = None,
+                         etag: str = None, last_modified: str = None
+                         ) -> Optional[Tuple[Any, Optional[str], Optional[str]]]:
+        """Conditional GET: None on 304, else (body, etag, last_modified)."""
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        resp, body = self._request(path, params, headers=headers)
+        if resp.status_code == 304:
+            return None
+        return body, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+    def _request(self, path: str, params: Dict = None, retries: int = 3,
+                 headers: Dict = None) -> Tuple[requests.Response, Any]:
+        """Issue a GET and return (response, parsed body); body is None on 304."""
         self._ensure_auth()
         self._rate_limit()
 
         url = f"{self.base_url}{path}"
         for attempt in range(1, retries + 1):
+            self._acquire_slot()
+            overloaded = False
             try:
-                resp = self.session.get(url, params=params, timeout=30)
+                stale = self._token
+                resp = self.session.get(url, params=params, headers=headers, timeout=30)
                 if resp.status_code == 401:
-                    self.authenticate()
-                    resp = self.session.get(url, params=params, timeout=30)
-                if resp.status_code == 429:
-                    wait = int(resp.headers.get("Retry-After", 30))
-                    logger.warning("Rate limited, waiting %ds", wait)
-                    time.sleep(wait)
-                    continue
-                resp.raise_for_status()
-                return resp.json()
-            except requests.RequestException as e:
-                if attempt < retries:
-                    time.sleep(attempt * 3)
-                    continue
-                raise
+                    self._reauthenticate(stale)
+                    resp = self.session.get(url, params=params, headers=headers, timeout=30)
+                if resp.status_code == 304:
+                    return resp, None
+                if resp.status_code not in (429, 503):
+                    resp.raise_for_status()
+                    return resp, resp.json()
+                overloaded = True
+            except requests.RequestException:
+                if attempt == retries:
+                    raise
+            finally:
+                self._release_slot(overloaded)
+
+            if attempt == retries:
+                break
+            # Back off outside the slot so other workers can use it
+            if overloaded:
+                wait = int(resp.headers.get("Retry-After", 30))
+                logger.warning("Keka overloaded [%d], waiting %ds", resp.status_code, wait)
+                time.sleep(wait)
+            else:
+                time.sleep(attempt * 3)
+
+        raise KekaRateLimitError(f"{path}: still rate limited after {retries} attempts")
 
     def _get_paginated(self, path: str, params: Dict = None,
                        max_pages: int = 100) -> List[Dict]:
         """Fetch all pages from a paginated endpoint."""
-        all_data = []
         params = dict(params or {})
         params.setdefault("pageSize", 100)
 
-        for page in range(1, max_pages + 1):
-            params["pageNumber"] = page
-            resp = self._get(path, params)
-
-            data = resp.get("data", resp.get("values", []))
-            if isinstance(data, list):
-                all_data.extend(data)
-            elif isinstance(data, dict) and "values" in data:
-                all_data.extend(data["values"])
-
-            # Check if more pages
-            page_info = resp.get("pageInfo", resp.get("pagination", {}))
-            total_pages = page_info.get("totalPages", page_info.get("total_pages", 1))
-            if page >= total_pages:
-                break
+        # Page 1 is fetched alone — only its pageInfo tells us how many follow
+        first = self._get(path, {**params, "pageNumber": 1})
+        all_data = self._page_records(first)
+        total_pages = min(self._total_pages(first), max_pages)
+        if total_pages <= 1:
+            return all_data
+
+        # Remaining pages are independent; fetch them concurrently, in order
+        with ThreadPoolExecutor(max_workers=self.PAGE_WORKERS) as pool:
+            for resp in pool.map(
+                lambda page: self._get(path, {**params, "pageNumber": page}),
+                range(2, total_pages + 1),
+            ):
+                all_data.extend(self._page_records(resp))
 
         return all_data
 
+    _page_records = staticmethod(page_records)
+    _total_pages = staticmethod(total_pages)
+
     # ── SQLite schema ─────────────────────────────────────────────────
 
     def _ensure_schema(self):
         conn = sqlite3.connect(self.db_path)
+        # WAL persists in the file: readers no longer block behind a sync write
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS employees (
                 id TEXT PRIMARY KEY, employee_number TEXT, first_name TEXT,
@@ -298,7 +375,9 @@ class KekaApiSyncer:
         conn.close()
 
     def _conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+        # Entity syncs may write concurrently; wait for the lock, don't fail
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
         conn.row_factory = sqlite3.Row
         return conn
 
@@ -306,17 +385,46 @@ class KekaApiSyncer:
         return datetime.now(IST).isoformat()
 
     def _log_sync(self, conn, entity: str, count: int, status: str = "success",
-                  error: str = None, date_from: str = None, date_to: str = None):
+                  error: str = None, date_from: str = None, date_to: str = None,
+                  payload_hash: str = None):
+        # Commits together with any rows the caller has not committed yet, so a
+        # stored payload_hash always describes data that actually landed
         now = self._now_ist()
+        meta = {"records_synced": count, "last_sync": now, "status": status}
+        if payload_hash:
+            meta["payload_hash"] = payload_hash
         conn.execute(
             "INSERT INTO sync_log (entity, started_at, completed_at, records_synced, "
             "status, error_message, date_from, date_to) VALUES (?,?,?,?,?,?,?,?)",
             (entity, now, now, count, status, error, date_from, date_to))
         conn.execute(
             "INSERT OR REPLACE INTO last_sync_meta (key, value, updated_at) VALUES (?,?,?)",
-            (entity, json.dumps({"records_synced": count, "last_sync": now, "status": status}), now))
+            (entity, json.dumps(meta), now))
         conn.commit()
 
+    @staticmethod
+    def _payload_hash(data: Any) -> str:
+        return hashlib.blake2b(json.dumps(data, sort_keys=True).encode(),
+                               digest_size=16).hexdigest()
+
+    def _skip_unchanged(self, conn, entity: str, data: List[Dict]) -> Tuple[Optional[int], str]:
+        """Return (last count, hash) if Keka sent the same payload as last sync.
+
+        The count is None when the payload changed and must be written.
+        """
+        payload_hash = self._payload_hash(data)
+        row = conn.execute(
+            "SELECT value FROM last_sync_meta WHERE key = ?", (entity,)
+        ).fetchone()
+        if row:
+            info = json.loads(row["value"])
+            if info.get("status") == "success" and info.get("payload_hash") == payload_hash:
+                count = info.get("records_synced", 0)
+                self._log_sync(conn, entity, count, payload_hash=payload_hash)
+                logger.info("%s unchanged since last sync (%d records)", entity, count)
+                return count, payload_hash
+        return None, payload_hash
+
     # ── Helper for extracting employee group info ─────────────────────
 
     @staticmethod
@@ -532,6 +640,10 @@ class KekaApiSyncer:
         logger.info("Syncing leave balances...")
         data = self._get_paginated("/time/leavebalance")
         conn = self._conn()
+        unchanged, payload_hash = self._skip_unchanged(conn, "leave_balances", data)
+        if unchanged is not None:
+            conn.close()
+            return unchanged
         now = self._now_ist()
         count = 0
         for lb in data:
@@ -548,8 +660,7 @@ class KekaApiSyncer:
                     (emp_id, emp_name, lt_name,
                      bal.get("balance", 0), bal.get("used", 0), now))
                 count += 1
-        conn.commit()
-        self._log_sync(conn, "leave_balances", count)
+        self._log_sync(conn, "leave_balances", count, payload_hash=payload_hash)
         conn.close()
         logger.info("Synced %d leave balances", count)
         return count
@@ -560,6 +671,10 @@ class KekaApiSyncer:
         logger.info("Syncing salaries...")
         data = self._get_paginated("/payroll/salaries")
         conn = self._conn()
+        unchanged, payload_hash = self._skip_unchanged(conn, "salaries", data)
+        if unchanged is not None:
+            conn.close()
+            return unchanged
         now = self._now_ist()
         count = 0
         for sal in data:
@@ -583,8 +698,7 @@ class KekaApiSyncer:
                     now,
                 ))
             count += 1
-        conn.commit()
-        self._log_sync(conn, "salaries", count)
+        self._log_sync(conn, "salaries", count, payload_hash=payload_hash)
         conn.close()
         logger.info("Synced %d salary records", count)
         return count
@@ -595,6 +709,10 @@ class KekaApiSyncer:
         logger.info("Syncing salary components...")
         data = self._get_paginated("/payroll/salarycomponents")
         conn = self._conn()
+        unchanged, payload_hash = self._skip_unchanged(conn, "salary_components", data)
+        if unchanged is not None:
+            conn.close()
+            return unchanged
         now = self._now_ist()
         count = 0
         for comp in data:
@@ -604,8 +722,7 @@ class KekaApiSyncer:
                 (comp.get("id"), comp.get("identifier", ""),
                  comp.get("title", ""), comp.get("accountingCode", ""), now))
             count += 1
-        conn.commit()
-        self._log_sync(conn, "salary_components", count)
+        self._log_sync(conn, "salary_components", count, payload_hash=payload_hash)
         conn.close()
         logger.info("Synced %d salary components", count)
         return count
@@ -616,6 +733,10 @@ class KekaApiSyncer:
         logger.info("Syncing expense claims...")
         data = self._get_paginated("/finance/expenseclaims")
         conn = self._conn()
+        unchanged, payload_hash = self._skip_unchanged(conn, "expense_claims", data)
+        if unchanged is not None:
+            conn.close()
+            return unchanged
         now = self._now_ist()
         count = 0
         for exp in data:
@@ -640,8 +761,7 @@ class KekaApiSyncer:
                     now,
                 ))
             count += 1
-        conn.commit()
-        self._log_sync(conn, "expense_claims", count)
+        self._log_sync(conn, "expense_claims", count, payload_hash=payload_hash)
         conn.close()
         logger.info("Synced %d expense claims", count)
         return count
@@ -652,6 +772,10 @@ class KekaApiSyncer:
         logger.info("Syncing helpdesk tickets...")
         data = self._get_paginated("/helpdesk/tickets")
         conn = self._conn()
+        unchanged, payload_hash = self._skip_unchanged(conn, "helpdesk_tickets", data)
+        if unchanged is not None:
+            conn.close()
+            return unchanged
         now = self._now_ist()
         count = 0
         for t in data:
@@ -678,8 +802,7 @@ class KekaApiSyncer:
                     now,
                 ))
             count += 1
-        conn.commit()
-        self._log_sync(conn, "helpdesk_tickets", count)
+        self._log_sync(conn, "helpdesk_tickets", count, payload_hash=payload_hash)
         conn.close()
         logger.info("Synced %d helpdesk tickets", count)
         return count
@@ -690,6 +813,10 @@ class KekaApiSyncer:
         logger.info("Syncing FnF settlements...")
         data = self._get_paginated("/payroll/fnf")
         conn = self._conn()
+        unchanged, payload_hash = self._skip_unchanged(conn, "fnf_settlements", data)
+        if unchanged is not None:
+            conn.close()
+            return unchanged
         now = self._now_ist()
         count = 0
         for f in data:
@@ -709,8 +836,7 @@ class KekaApiSyncer:
                     now,
                 ))
             count += 1
-        conn.commit()
-        self._log_sync(conn, "fnf_settlements", count)
+        self._log_sync(conn, "fnf_settlements", count, payload_hash=payload_hash)
         conn.close()
         logger.info("Synced %d FnF settlements", count)
         return count
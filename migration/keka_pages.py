@@ -0,0 +1,19 @@
+"""Keka paginated-response helpers shared by the sync scripts."""
+
+from typing import Any
+
+
+def page_records(resp: dict[str, Any]) -> list[dict[str, Any]]:
+    """Records on one Keka page (``data``/``values``, possibly nested)."""
+    data = resp.get("data", resp.get("values", []))
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and "values" in data:
+        return data["values"]
+    return []
+
+
+def total_pages(resp: dict[str, Any]) -> int:
+    """Page count advertised by a Keka page's ``pageInfo``/``pagination``."""
+    page_info = resp.get("pageInfo", resp.get("pagination", {}))
+    return page_info.get("totalPages", page_info.get("total_pages", 1))
@@ -0,0 +1,23 @@
+"""Helpers for bulk-loading rows into PostgreSQL with COPY … FROM STDIN."""
+
+import io
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+
+def copy_text(val: Any) -> str:
+    """Encode one value for COPY's text format."""
+    if val is None:
+        return "\\N"
+    return (str(val).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def copy_rows(rows: Iterable[Sequence[Any]]) -> io.StringIO:
+    """Return a rewound COPY text-format buffer holding ``rows``."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(copy_text(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
@@ -0,0 +1,26 @@
+"""Keka OAuth token cache shared by the sync scripts.
+
+migration/keka_api_sync.py and scripts/keka_incremental_sync.py both read
+and write the same cache file, possibly at the same time from cron.
+"""
+
+import fcntl
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+TOKEN_CACHE = Path(__file__).resolve().parent / ".keka_token_cache.json"
+
+
+def save_token_cache(data: dict[str, Any]) -> None:
+    """Atomically replace the token cache with ``data``.
+
+    Write-then-rename so readers never see a partial file; the lock keeps
+    concurrent sync scripts from clobbering each other's temp file.
+    """
+    tmp = TOKEN_CACHE.with_suffix(".tmp")
+    with open(TOKEN_CACHE.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, TOKEN_CACHE)
@@ -46,6 +46,11 @@ def validate() -> Tuple[int, int]:
         sq = None
         sq_cur = None
         print("  ⚠ SQLite database not found — skipping count comparisons")
+    else:
+        # An empty/archived source makes every comparison meaningless — probe once
+        if _count_sqlite(sq_cur, "employees") == 0:
+            sq_cur = None
+            print("  ⚠ SQLite database has no employees — skipping count comparisons")
 
     pg = get_pg_conn()
     pg_cur = pg.cursor()
@@ -228,9 +233,12 @@ def validate() -> Tuple[int, int]:
 
     # ── 7. Locations ─────────────────────────────────────────────────
     print("\n── Locations ──")
-    pg_cur.execute("SELECT name FROM locations WHERE is_active = TRUE ORDER BY name")
-    locs = [row[0] for row in pg_cur.fetchall()]
-    print(f"  ✓ Active locations: {', '.join(locs) or '(none)'}")
+    pg_cur.execute(
+        "SELECT COALESCE(string_agg(name, ', ' ORDER BY name), '(none)') "
+        "FROM locations WHERE is_active = TRUE"
+    )
+    locs_str = pg_cur.fetchone()[0]
+    print(f"  ✓ Active locations: {locs_str}")
     passed += 1
 
     # ── Summary ──────────────────────────────────────────────────────
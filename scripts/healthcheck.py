@@ -293,11 +293,9 @@ def check_ssl_certificate(hostname: str, port: int = 443,
         # Parse expiry
         not_after = cert.get("notAfter", "")
         if not_after:
-            # Format: 'Mar 15 12:00:00 2025 GMT'
-            expiry = datetime.strptime(not_after, "%b %d %H:%M:%S %Y %Z")
-            expiry = expiry.replace(tzinfo=timezone.utc)
-            now = datetime.now(timezone.utc)
-            days_left = (expiry - now).days
+            # Format: 'Mar 15 12:00:00 2025 GMT' — parsed by OpenSSL, locale-independent
+            expiry_ts = ssl.cert_time_to_seconds(not_after)
+            days_left = int((expiry_ts - time.time()) // 86400)
 
             # Check issuer
             issuer = dict(x[0] for x in cert.get("issuer", []))
@@ -21,19 +21,44 @@ Optionally:
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import os
 import sqlite3
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-import requests
+import httpx
 from dotenv import load_dotenv
 
+# Optional: orjson serializes leave payloads several times faster than stdlib json
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Optional: h2 lets httpx multiplex concurrent page fetches over one HTTP/2 connection
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 # ── Path setup ────────────────────────────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -56,9 +81,7 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 logger = logging.getLogger("keka_inc_sync")
-
-# ── Token cache (shared with keka_api_sync) ──────────────────────────
-TOKEN_CACHE = PROJECT_ROOT / "migration" / ".keka_token_cache.json"
+logging.getLogger("httpx").setLevel(logging.WARNING)  # per-request INFO lines drown the sync log
 
 # ── SQLite path resolution ────────────────────────────────────────────
 SQLITE_CANDIDATES = [
@@ -83,6 +106,8 @@ class KekaClient:
     """Authenticated Keka API client with rate limiting."""
 
     TOKEN_URL = "https://login.keka.com/connect/token"
+    RATE_LIMIT_PER_MIN = 48
+    PAGE_WORKERS = 4
 
     def __init__(self):
         self.api_key = os.getenv("KEKA_API_KEY", "")
@@ -93,14 +118,21 @@ class KekaClient:
 
         self._token: Optional[str] = None
         self._token_expires: float = 0
-        self._req_count = 0
-        self._minute_start = time.time()
-
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/json",
-            "User-Agent": "HRIntelligence/2.0 IncrementalSync",
-        })
+        self._auth_lock = threading.Lock()
+        # Monotonic start times of the most recent RATE_LIMIT_PER_MIN calls
+        self._calls: deque = deque(maxlen=self.RATE_LIMIT_PER_MIN)
+        self._rate_lock = threading.Lock()
+
+        # httpx.Client is thread-safe and keeps connections alive across pages
+        self.session = httpx.Client(
+            http2=HAS_HTTP2,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=self.PAGE_WORKERS * 2),
+            headers={
+                "Accept": "application/json",
+                "User-Agent": "HRIntelligence/2.0 IncrementalSync",
+            },
+        )
 
         self._load_cached_token()
 
@@ -120,10 +152,13 @@ class KekaClient:
     # ── Auth ──────────────────────────────────────────────────────────
 
     def _load_cached_token(self):
+        # Same cache file as keka_api_sync
+        from migration.token_cache import TOKEN_CACHE
         if TOKEN_CACHE.exists():
             try:
-                data = json.loads(TOKEN_CACHE.read_text())
-                if data.get("expires_at", 0) > time.time() + 300:
+                data = _json_loads(TOKEN_CACHE.read_bytes())
+                # expires_at already carries the 300s safety margin from authenticate()
+                if data.get("expires_at", 0) > time.time():
                     self._token = data["access_token"]
                     self._token_expires = data["expires_at"]
                     self.session.headers["Authorization"] = f"Bearer {self._token}"
@@ -133,11 +168,12 @@ class KekaClient:
                 pass
 
     def _save_cached_token(self):
-        TOKEN_CACHE.write_text(json.dumps({
+        from migration.token_cache import save_token_cache
+        save_token_cache({
             "access_token": self._token,
             "expires_at": self._token_expires,
             "cached_at": datetime.now(IST).isoformat(),
-        }))
+        })
 
     def authenticate(self):
         """Keka OAuth2 — grant_type=kekaapi, scope=kekaapi."""
@@ -146,7 +182,7 @@ class KekaClient:
             raise ValueError(f"Missing Keka credentials: {', '.join(missing)}")
 
         logger.info("Authenticating with Keka API (%s)…", self.base_url)
-        resp = requests.post(self.TOKEN_URL, data={
+        resp = httpx.post(self.TOKEN_URL, data={
             "grant_type": "kekaapi",
             "scope": "kekaapi",
             "client_id": self.client_id,
@@ -171,27 +207,30 @@ class KekaClient:
                      data.get("expires_in", 0) // 3600)
 
     def _ensure_auth(self):
-        if not self._token or time.time() >= self._token_expires:
-            self.authenticate()
+        # Page workers race here when the token expires; only the first re-auths
+        with self._auth_lock:
+            if not self._token or time.time() >= self._token_expires:
+                self.authenticate()
+
+    def _reauthenticate(self, stale: Optional[str]):
+        """Refresh after a 401 unless another worker already replaced ``stale``."""
+        with self._auth_lock:
+            if self._token == stale:
+                self.authenticate()
 
     # ── Rate limiting (50 calls/min, 48 to leave buffer) ─────────────
 
     def _rate_limit(self):
-        now = time.time()
-        if now - self._minute_start >= 60:
-            self._req_count = 0
-            self._minute_start = now
-
-        if self._req_count >= 48:
-            wait = 60 - (now - self._minute_start) + 1
-            if wait > 0:
-                logger.info("Rate limit pause: %.1fs", wait)
-                time.sleep(wait)
-            self._req_count = 0
-            self._minute_start = time.time()
-
-        self._req_count += 1
-        time.sleep(0.5)
+        """Sliding window: never more than 48 calls in any 60 seconds."""
+        # Held across the sleep so concurrent page workers queue on the window
+        with self._rate_lock:
+            if len(self._calls) == self._calls.maxlen:
+                wait = 60 - (time.monotonic() - self._calls[0])
+                if wait > 0:
+                    logger.debug("Rate limit pause: %.1fs", wait)
+                    time.sleep(wait)
+            # maxlen drops the oldest call, which is now at least 60s old
+            self._calls.append(time.monotonic())
 
     # ── HTTP with retry ───────────────────────────────────────────────
 
@@ -202,11 +241,12 @@ class KekaClient:
         url = f"{self.base_url}{path}"
         for attempt in range(1, retries + 1):
             try:
-                resp = self.session.get(url, params=params, timeout=30)
+                stale = self._token
+                resp = self.session.get(url, params=params)
                 if resp.status_code == 401:
                     logger.warning("401 — re-authenticating")
-                    self.authenticate()
-                    resp = self.session.get(url, params=params, timeout=30)
+                    self._reauthenticate(stale)
+                    resp = self.session.get(url, params=params)
                 if resp.status_code == 429:
                     wait = int(resp.headers.get("Retry-After", 30))
                     logger.warning("429 rate-limited, waiting %ds", wait)
@@ -214,36 +254,53 @@ class KekaClient:
                     continue
                 resp.raise_for_status()
                 return resp.json()
-            except requests.RequestException as e:
+            except (httpx.HTTPError, ValueError) as e:  # ValueError: malformed JSON body
                 if attempt < retries:
                     logger.warning("Request failed (attempt %d/%d): %s", attempt, retries, e)
                     time.sleep(attempt * 3)
                     continue
                 raise
 
-    def get_paginated(self, path: str, params: Dict = None,
-                      max_pages: int = 100) -> List[Dict]:
-        all_data = []
+    def iter_paginated(self, path: str, params: Dict = None,
+                       max_pages: int = 100) -> Iterator[Dict]:
+        """Yield records page by page so callers never hold the full raw result set."""
+        from migration import keka_pages
+
         params = dict(params or {})
         params.setdefault("pageSize", 100)
 
-        for page in range(1, max_pages + 1):
-            params["pageNumber"] = page
-            resp = self.get(path, params)
+        # Page 1 is fetched alone — only its pageInfo tells us how many follow
+        first = self.get(path, {**params, "pageNumber": 1})
+        records = keka_pages.page_records(first)
+        yield from records
+
+        total_pages = min(keka_pages.total_pages(first), max_pages)
+        if total_pages <= 1:
+            return
+        seen = len(records)
+        logger.info("  Page 1/%d (%d records so far)", total_pages, seen)
+
+        # Sliding window of PAGE_WORKERS pages: each page handed to the caller
+        # requests one more, so a slow consumer never has every page buffered
+        next_pages = iter(range(2, total_pages + 1))
+        with ThreadPoolExecutor(max_workers=self.PAGE_WORKERS) as pool:
+            def submit(page: int):
+                return page, pool.submit(self.get, path, {**params, "pageNumber": page})
+
+            window = deque(submit(p) for p in itertools.islice(next_pages, self.PAGE_WORKERS))
+            while window:
+                page, future = window.popleft()
+                nxt = next(next_pages, None)
+                if nxt is not None:
+                    window.append(submit(nxt))
+                records = keka_pages.page_records(future.result())
+                seen += len(records)
+                logger.info("  Page %d/%d (%d records so far)", page, total_pages, seen)
+                yield from records
 
-            data = resp.get("data", resp.get("values", []))
-            if isinstance(data, list):
-                all_data.extend(data)
-            elif isinstance(data, dict) and "values" in data:
-                all_data.extend(data["values"])
-
-            page_info = resp.get("pageInfo", resp.get("pagination", {}))
-            total_pages = page_info.get("totalPages", page_info.get("total_pages", 1))
-            if page >= total_pages:
-                break
-            logger.info("  Page %d/%d (%d records so far)", page, total_pages, len(all_data))
-
-        return all_data
+    def get_paginated(self, path: str, params: Dict = None,
+                      max_pages: int = 100) -> List[Dict]:
+        return list(self.iter_paginated(path, params, max_pages))
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -254,14 +311,19 @@ def _ensure_sqlite(db_path: str) -> sqlite3.Connection:
     """Open (or create) the SQLite DB with required schema."""
     os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
     conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    # WAL + NORMAL sync: one fsync per checkpoint instead of two per commit
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
     conn.executescript("""
         CREATE TABLE IF NOT EXISTS attendance (
             id TEXT PRIMARY KEY, employee_id TEXT, employee_number TEXT,
             attendance_date TEXT, day_type TEXT, clock_in TEXT,
             clock_out TEXT, total_hours REAL, gross_hours REAL,
             overtime_hours REAL, status TEXT, arrival_status TEXT,
-            synced_at TEXT, UNIQUE(employee_id, attendance_date)
+            synced_at TEXT, content_hash TEXT, UNIQUE(employee_id, attendance_date)
         );
         CREATE TABLE IF NOT EXISTS leave_requests (
             id TEXT PRIMARY KEY, employee_id TEXT, employee_number TEXT,
@@ -275,9 +337,90 @@ def _ensure_sqlite(db_path: str) -> sqlite3.Connection:
             status TEXT, error_message TEXT, date_from TEXT, date_to TEXT
         );
     """)
+    # Older DBs (and the full-sync schema) predate the content_hash column
+    if "content_hash" not in {col[1] for col in conn.execute("PRAGMA table_info(attendance)")}:
+        conn.execute("ALTER TABLE attendance ADD COLUMN content_hash TEXT")
     return conn
 
 
+class AttendanceRow(NamedTuple):
+    """One flattened attendance record, in _SQL_INSERT_ATTENDANCE column order."""
+
+    id: str
+    employee_id: str
+    employee_number: str
+    attendance_date: Optional[str]
+    day_type: str
+    clock_in: Optional[str]
+    clock_out: Optional[str]
+    total_hours: Any
+    gross_hours: Any
+    overtime_hours: Any
+    status: Any
+    arrival_status: str
+    synced_at: str
+    content_hash: str
+
+
+_SQL_INSERT_ATTENDANCE = """INSERT OR REPLACE INTO attendance
+    (id, employee_id, employee_number, attendance_date, day_type,
+     clock_in, clock_out, total_hours, gross_hours, overtime_hours,
+     status, arrival_status, synced_at, content_hash)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)"""
+
+_SQL_INSERT_LEAVE = """INSERT OR REPLACE INTO leave_requests
+    (id, employee_id, employee_number, employee_name, from_date,
+     to_date, leave_type, status, reason, number_of_days,
+     raw_json, synced_at)
+    VALUES (?,?,?,?,?,?,?,?,?,?,?,?)"""
+
+_SQL_INSERT_SYNC_LOG = (
+    "INSERT INTO sync_log (entity, started_at, completed_at, records_synced, "
+    "status, date_from, date_to) VALUES (?,?,?,?,?,?,?)"
+)
+
+
+# Above this many rows, rebuilding helper indexes once beats maintaining them per row
+_BULK_INDEX_THRESHOLD = 5000
+
+
+def _drop_helper_indexes(cur: sqlite3.Cursor, table: str) -> List[str]:
+    """Drop explicit non-unique indexes on *table*, returning their CREATE statements.
+
+    Constraint indexes (PK/UNIQUE) have no ``sql`` and are left alone — INSERT OR
+    REPLACE relies on them for conflict detection.
+    """
+    cur.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? "
+        "AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'",
+        (table,),
+    )
+    indexes = cur.fetchall()
+    for name, _ in indexes:
+        cur.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in indexes]
+
+
+def _content_hash(payload: Tuple) -> str:
+    """Short digest of a row's synced fields, used to skip rewriting unchanged rows."""
+    return hashlib.blake2b(repr(payload).encode(), digest_size=8).hexdigest()
+
+
+def _unchanged_attendance(cur: sqlite3.Cursor, rows: List[AttendanceRow]) -> set:
+    """Return the (employee_id, attendance_date) keys whose stored hash matches."""
+    dates = [r.attendance_date for r in rows if r.attendance_date]
+    if not dates:
+        return set()
+    cur.execute(
+        "SELECT employee_id, attendance_date, content_hash FROM attendance "
+        "WHERE attendance_date BETWEEN ? AND ? AND content_hash IS NOT NULL",
+        (min(dates), max(dates)),
+    )
+    stored = {(emp, day): h for emp, day, h in cur.fetchall()}
+    return {(r.employee_id, r.attendance_date) for r in rows
+            if stored.get((r.employee_id, r.attendance_date)) == r.content_hash}
+
+
 def _now_ist() -> str:
     return datetime.now(IST).isoformat()
 
@@ -285,19 +428,42 @@ def _now_ist() -> str:
 def _date_str(val) -> Optional[str]:
     if not val:
         return None
-    return str(val)[:10] if "T" in str(val) else str(val)
+    s = val if isinstance(val, str) else str(val)
+    return s[:10] if "T" in s else s
+
+
+_DAY_TYPES = {0: "WorkingDay", 1: "Holiday", 2: "WeeklyOff"}
+
+_IST_OFFSET_MIN = 330
 
 
 def _day_type_str(day_type: int) -> str:
-    return {0: "WorkingDay", 1: "Holiday", 2: "WeeklyOff"}.get(day_type, f"Type{day_type}")
+    return _DAY_TYPES.get(day_type, f"Type{day_type}")
+
+
+def _utc_offset_minutes(ts: str) -> Optional[int]:
+    """Offset of an ISO timestamp's 'Z' / '±HH:MM' suffix, or None if it has none."""
+    if ts.endswith("Z"):
+        return 0
+    if len(ts) > 19 and ts[-6] in "+-" and ts[-3] == ":":
+        offset = int(ts[-5:-3]) * 60 + int(ts[-2:])
+        return -offset if ts[-6] == "-" else offset
+    return None
 
 
 def _classify_arrival(clock_in_str: Optional[str]) -> str:
     if not clock_in_str:
         return "ABSENT"
     try:
-        dt = datetime.fromisoformat(clock_in_str.replace("Z", "+00:00")).astimezone(IST)
-        mins = dt.hour * 60 + dt.minute
+        s = clock_in_str
+        offset = _utc_offset_minutes(s) if s[10:11] in ("T", " ") and s[13:14] == ":" else None
+        if offset is not None:
+            # Minutes-of-day straight from 'YYYY-MM-DDTHH:MM', shifted to IST
+            mins = (int(s[11:13]) * 60 + int(s[14:16]) - offset + _IST_OFFSET_MIN) % 1440
+        else:
+            # Naive or unusual formats: keep datetime's local-time semantics
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00")).astimezone(IST)
+            mins = dt.hour * 60 + dt.minute
         if mins <= 630:
             return "ON_TIME"
         elif mins <= 660:
@@ -308,8 +474,11 @@ def _classify_arrival(clock_in_str: Optional[str]) -> str:
         return "ABSENT"
 
 
+_LEAVE_STATUSES = {0: "Pending", 1: "Approved", 2: "Rejected", 3: "Cancelled"}
+
+
 def _leave_status_str(status: int) -> str:
-    return {0: "Pending", 1: "Approved", 2: "Rejected", 3: "Cancelled"}.get(status, f"Status{status}")
+    return _LEAVE_STATUSES.get(status, f"Status{status}")
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -327,69 +496,101 @@ def _pg_available() -> bool:
         return False
 
 
-def _pg_upsert_attendance(records: List[Dict]) -> int:
+_PG_ATTENDANCE_COLUMNS = (
+    "id, employee_id, date, status, arrival_status, first_clock_in, last_clock_out, "
+    "total_work_minutes, effective_work_minutes, overtime_minutes, source"
+)
+
+_PG_ATTENDANCE_ON_CONFLICT = """ON CONFLICT ON CONSTRAINT uq_attendance_emp_date
+    DO UPDATE SET
+        status = EXCLUDED.status,
+        arrival_status = EXCLUDED.arrival_status,
+        first_clock_in = EXCLUDED.first_clock_in,
+        last_clock_out = EXCLUDED.last_clock_out,
+        total_work_minutes = EXCLUDED.total_work_minutes,
+        effective_work_minutes = EXCLUDED.effective_work_minutes,
+        overtime_minutes = EXCLUDED.overtime_minutes,
+        updated_at = NOW()"""
+
+# Backfills this large are staged with COPY and merged in one statement
+_PG_COPY_THRESHOLD = 50_000
+
+
+@functools.lru_cache(maxsize=1)
+def _load_emp_map(db_url: str) -> Dict[str, str]:
+    """Build the employee Keka→PG ID map once per process."""
+    import psycopg2
+
+    conn = psycopg2.connect(db_url)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT id, keka_id FROM employees WHERE keka_id IS NOT NULL")
+        return {str(keka_id): str(pg_id) for pg_id, keka_id in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def _pg_upsert_attendance(records: List[AttendanceRow]) -> int:
     """Upsert attendance records into PostgreSQL attendance_records table."""
     import uuid
     import psycopg2
+    from psycopg2.extras import execute_values
     from migration.config import DATABASE_URL_SYNC
     from migration.migrate_attendance import (
         _parse_datetime, _hours_to_minutes, _resolve_status, _resolve_arrival,
     )
+    from migration.pg_copy import copy_rows
+
+    emp_map = _load_emp_map(DATABASE_URL_SYNC)
+
+    # Keyed by (employee, date): a single multi-row ON CONFLICT statement cannot
+    # touch the same row twice, so later duplicates win as they did row-by-row.
+    rows_by_key = {
+        (pg_emp_id, att_date): (
+            str(uuid.uuid4()),
+            pg_emp_id,
+            att_date,
+            _resolve_status(rec.status),
+            _resolve_arrival(rec.arrival_status),
+            _parse_datetime(rec.clock_in),
+            _parse_datetime(rec.clock_out),
+            _hours_to_minutes(rec.total_hours),
+            _hours_to_minutes(rec.gross_hours),
+            _hours_to_minutes(rec.overtime_hours),
+            "keka_incremental_sync",
+        )
+        for rec in records
+        if (pg_emp_id := emp_map.get(rec.employee_id))
+        and (att_date := rec.attendance_date)
+    }
+    rows = list(rows_by_key.values())
 
     conn = psycopg2.connect(DATABASE_URL_SYNC)
     cur = conn.cursor()
-
-    # Build employee Keka→PG ID map
-    cur.execute("SELECT id, keka_id FROM employees WHERE keka_id IS NOT NULL")
-    emp_map = {str(row[1]): row[0] for row in cur.fetchall()}
-
-    inserted = 0
-    for rec in records:
-        keka_emp_id = rec.get("employee_id", "")
-        pg_emp_id = emp_map.get(keka_emp_id)
-        if not pg_emp_id:
-            continue
-
-        att_date = rec.get("attendance_date", "")
-        if not att_date:
-            continue
-
+    if len(rows) >= _PG_COPY_THRESHOLD:
+        buf = copy_rows(rows)
+        cur.execute(
+            "CREATE TEMP TABLE attendance_stage "
+            "(LIKE attendance_records INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cur.copy_expert(f"COPY attendance_stage ({_PG_ATTENDANCE_COLUMNS}) FROM STDIN", buf)
         cur.execute(
-            """INSERT INTO attendance_records
-               (id, employee_id, date, status, arrival_status,
-                first_clock_in, last_clock_out,
-                total_work_minutes, effective_work_minutes,
-                overtime_minutes, source)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-               ON CONFLICT ON CONSTRAINT uq_attendance_emp_date
-               DO UPDATE SET
-                   status = EXCLUDED.status,
-                   arrival_status = EXCLUDED.arrival_status,
-                   first_clock_in = EXCLUDED.first_clock_in,
-                   last_clock_out = EXCLUDED.last_clock_out,
-                   total_work_minutes = EXCLUDED.total_work_minutes,
-                   effective_work_minutes = EXCLUDED.effective_work_minutes,
-                   overtime_minutes = EXCLUDED.overtime_minutes,
-                   updated_at = NOW()""",
-            (
-                str(uuid.uuid4()),
-                str(pg_emp_id),
-                att_date,
-                _resolve_status(rec.get("status")),
-                _resolve_arrival(rec.get("arrival_status")),
-                _parse_datetime(rec.get("clock_in")),
-                _parse_datetime(rec.get("clock_out")),
-                _hours_to_minutes(rec.get("total_hours")),
-                _hours_to_minutes(rec.get("gross_hours")),
-                _hours_to_minutes(rec.get("overtime_hours")),
-                "keka_incremental_sync",
-            ),
+            f"INSERT INTO attendance_records ({_PG_ATTENDANCE_COLUMNS}) "
+            f"SELECT {_PG_ATTENDANCE_COLUMNS} FROM attendance_stage "
+            f"{_PG_ATTENDANCE_ON_CONFLICT}"
+        )
+    else:
+        execute_values(
+            cur,
+            f"INSERT INTO attendance_records ({_PG_ATTENDANCE_COLUMNS}) VALUES %s "
+            f"{_PG_ATTENDANCE_ON_CONFLICT}",
+            rows,
+            page_size=500,
         )
-        inserted += 1
 
     conn.commit()
     conn.close()
-    return inserted
+    return len(rows)
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -397,65 +598,73 @@ def _pg_upsert_attendance(records: List[Dict]) -> int:
 # ══════════════════════════════════════════════════════════════════════
 
 def sync_attendance(client: KekaClient, from_date: str, to_date: str,
-                    conn: sqlite3.Connection, dry_run: bool = False) -> Tuple[int, List[Dict]]:
+                    conn: sqlite3.Connection, dry_run: bool = False) -> Tuple[int, List[AttendanceRow]]:
     """Pull attendance data for date range. Returns (count, flat_records)."""
     logger.info("📋 Fetching attendance %s → %s", from_date, to_date)
-    data = client.get_paginated("/time/attendance", {
+    data = client.iter_paginated("/time/attendance", {
         "fromDate": from_date,
         "toDate": to_date,
     })
-    logger.info("  Received %d raw records from API", len(data))
 
     now = _now_ist()
-    flat_records = []
+    # Overlapping pages can repeat (employee, date) — keep the last occurrence
+    by_key: Dict[Tuple[str, str], AttendanceRow] = {}
+    received = undated = 0
 
     for rec in data:
+        received += 1
         emp_id = rec.get("employeeId", "")
         att_date = _date_str(rec.get("attendanceDate"))
+        if att_date is None:
+            # Undated rows would all share one dedupe key, and the PG step drops them anyway
+            undated += 1
+            continue
         clock_in = rec.get("originalClockIn", {})
         clock_out = rec.get("originalClockOut", {})
         ci_str = clock_in.get("dateTime") if isinstance(clock_in, dict) else None
         co_str = clock_out.get("dateTime") if isinstance(clock_out, dict) else None
 
-        flat = {
-            "id": rec.get("id", f"{emp_id}_{att_date}"),
-            "employee_id": emp_id,
-            "employee_number": rec.get("employeeNumber", ""),
-            "attendance_date": att_date,
-            "day_type": _day_type_str(rec.get("dayType", 0)),
-            "clock_in": ci_str,
-            "clock_out": co_str,
-            "total_hours": rec.get("totalHours", 0),
-            "gross_hours": rec.get("grossHours", 0),
-            "overtime_hours": rec.get("overtimeHours", 0),
-            "status": rec.get("status", ""),
-            "arrival_status": _classify_arrival(ci_str),
-            "synced_at": now,
-        }
-        flat_records.append(flat)
+        payload = (
+            rec.get("id") or f"{emp_id}_{att_date}",
+            emp_id,
+            rec.get("employeeNumber", ""),
+            att_date,
+            _day_type_str(rec.get("dayType", 0)),
+            ci_str,
+            co_str,
+            rec.get("totalHours", 0),
+            rec.get("grossHours", 0),
+            rec.get("overtimeHours", 0),
+            rec.get("status", ""),
+            _classify_arrival(ci_str),
+        )
+        by_key[(emp_id, att_date)] = AttendanceRow(*payload, now, _content_hash(payload))
+    flat_records = list(by_key.values())
+    logger.info("  Received %d raw records from API (%d unique)", received, len(flat_records))
+    if undated:
+        logger.warning("  Skipped %d attendance records with no attendanceDate", undated)
 
     if dry_run:
         logger.info("  [DRY RUN] Would insert %d attendance records", len(flat_records))
         return len(flat_records), flat_records
 
-    for flat in flat_records:
-        conn.execute(
-            """INSERT OR REPLACE INTO attendance
-               (id, employee_id, employee_number, attendance_date, day_type,
-                clock_in, clock_out, total_hours, gross_hours, overtime_hours,
-                status, arrival_status, synced_at)
-               VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-            tuple(flat.values()),
-        )
-
-    conn.execute(
-        "INSERT INTO sync_log (entity, started_at, completed_at, records_synced, "
-        "status, date_from, date_to) VALUES (?,?,?,?,?,?,?)",
-        ("attendance_incremental", now, _now_ist(), len(flat_records),
-         "success", from_date, to_date),
-    )
-    conn.commit()
-    logger.info("  ✅ Saved %d attendance records to SQLite", len(flat_records))
+    cur = conn.cursor()
+    with conn:
+        cur.execute("BEGIN IMMEDIATE")
+        # Re-pulled days mostly come back identical — only rewrite rows that changed
+        unchanged = _unchanged_attendance(cur, flat_records)
+        changed = [r for r in flat_records if (r.employee_id, r.attendance_date) not in unchanged]
+        recreate = (_drop_helper_indexes(cur, "attendance")
+                    if len(changed) > _BULK_INDEX_THRESHOLD else [])
+        cur.executemany(_SQL_INSERT_ATTENDANCE, changed)
+        for index_sql in recreate:
+            cur.execute(index_sql)
+        cur.execute(_SQL_INSERT_SYNC_LOG, (
+            "attendance_incremental", now, _now_ist(), len(flat_records),
+            "success", from_date, to_date,
+        ))
+    logger.info("  ✅ Saved %d attendance records to SQLite (%d unchanged)",
+                len(changed), len(unchanged))
     return len(flat_records), flat_records
 
 
@@ -463,52 +672,49 @@ def sync_leaves(client: KekaClient, from_date: str, to_date: str,
                 conn: sqlite3.Connection, dry_run: bool = False) -> int:
     """Pull leave requests for date range."""
     logger.info("📋 Fetching leave requests %s → %s", from_date, to_date)
-    data = client.get_paginated("/time/leave", {
+    data = client.iter_paginated("/time/leave", {
         "fromDate": from_date,
         "toDate": to_date,
     })
-    logger.info("  Received %d raw records from API", len(data))
 
     now = _now_ist()
-    count = 0
+    rows_by_id: Dict[Any, Tuple] = {}
+    received = 0
 
     for lr in data:
+        received += 1
         leave_type = lr.get("leaveType", {})
         lt_name = leave_type.get("name", "") if isinstance(leave_type, dict) else str(leave_type)
         status_val = lr.get("status")
         status = _leave_status_str(status_val) if isinstance(status_val, int) else str(status_val or "Pending")
 
-        if not dry_run:
-            conn.execute(
-                """INSERT OR REPLACE INTO leave_requests
-                   (id, employee_id, employee_number, employee_name, from_date,
-                    to_date, leave_type, status, reason, number_of_days,
-                    raw_json, synced_at)
-                   VALUES (?,?,?,?,?,?,?,?,?,?,?,?)""",
-                (
-                    lr.get("id"),
-                    lr.get("employeeId", ""),
-                    lr.get("employeeNumber", ""),
-                    lr.get("employeeName", ""),
-                    _date_str(lr.get("fromDate")),
-                    _date_str(lr.get("toDate")),
-                    lt_name,
-                    status,
-                    lr.get("reason", ""),
-                    lr.get("numberOfDays", 0),
-                    json.dumps(lr),
-                    now,
-                ))
-        count += 1
+        rows_by_id[lr.get("id")] = (
+            lr.get("id"),
+            lr.get("employeeId", ""),
+            lr.get("employeeNumber", ""),
+            lr.get("employeeName", ""),
+            _date_str(lr.get("fromDate")),
+            _date_str(lr.get("toDate")),
+            lt_name,
+            status,
+            lr.get("reason", ""),
+            lr.get("numberOfDays", 0),
+            _json_dumps(lr),
+            now,
+        )
+    rows = list(rows_by_id.values())
+    count = len(rows)
+    logger.info("  Received %d raw records from API (%d unique)", received, count)
 
     if not dry_run:
-        conn.execute(
-            "INSERT INTO sync_log (entity, started_at, completed_at, records_synced, "
-            "status, date_from, date_to) VALUES (?,?,?,?,?,?,?)",
-            ("leave_requests_incremental", now, _now_ist(), count,
-             "success", from_date, to_date),
-        )
-        conn.commit()
+        cur = conn.cursor()
+        with conn:
+            cur.execute("BEGIN IMMEDIATE")
+            cur.executemany(_SQL_INSERT_LEAVE, rows)
+            cur.execute(_SQL_INSERT_SYNC_LOG, (
+                "leave_requests_incremental", now, _now_ist(), count,
+                "success", from_date, to_date,
+            ))
         logger.info("  ✅ Saved %d leave requests to SQLite", count)
     else:
         logger.info("  [DRY RUN] Would insert %d leave requests", count)
@@ -520,6 +726,15 @@ def sync_leaves(client: KekaClient, from_date: str, to_date: str,
 # Main
 # ══════════════════════════════════════════════════════════════════════
 
+_RULE = "=" * 60
+
+
+def _banner(*lines: str) -> None:
+    """Write a framed banner to stdout in a single write."""
+    sys.stdout.write("\n".join(("", _RULE, *lines, _RULE, "", "")))
+    sys.stdout.flush()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Keka API Incremental Sync — fill attendance/leave gaps",
@@ -558,35 +773,22 @@ Examples:
     # ── Resolve SQLite path ───────────────────────────────────────────
     db_path = args.db or SQLITE_PATH or str(PROJECT_ROOT / "data" / "keka.db")
 
-    print(f"""
-{'=' * 60}
-  KEKA INCREMENTAL SYNC
-  Date range : {from_date} → {to_date}
-  SQLite     : {db_path}
-  Dry run    : {args.dry_run}
-  PG upsert  : {'skip' if args.sqlite_only else 'if available'}
-{'=' * 60}
-""")
+    _banner(
+        "  KEKA INCREMENTAL SYNC",
+        f"  Date range : {from_date} → {to_date}",
+        f"  SQLite     : {db_path}",
+        f"  Dry run    : {args.dry_run}",
+        f"  PG upsert  : {'skip' if args.sqlite_only else 'if available'}",
+    )
 
     # ── Credentials check ─────────────────────────────────────────────
     client = KekaClient()
     missing = client.check_credentials()
     if missing:
-        print(f"\n❌ BLOCKED — Missing Keka API credentials:\n")
-        for var in missing:
-            print(f"   • {var}")
-        print(f"""
-To fix: create {PROJECT_ROOT / '.env'} with:
-
-    KEKA_API_KEY=<your-api-key>
-    KEKA_CLIENT_ID=<your-client-id>
-    KEKA_CLIENT_SECRET=<your-client-secret>
-
-Get these from Keka Admin → Settings → API → Generate API Key
-(Requires Keka Global Admin role)
-
-Alternatively, set them as environment variables before running.
-""")
+        logger.error("❌ BLOCKED — Missing Keka API credentials: %s", ", ".join(missing))
+        logger.error("Set them in %s or as environment variables "
+                     "(Keka Admin → Settings → API → Generate API Key; "
+                     "requires Keka Global Admin role)", PROJECT_ROOT / ".env")
         sys.exit(1)
 
     # ── Authenticate ──────────────────────────────────────────────────
@@ -623,15 +825,13 @@ Alternatively, set them as environment variables before running.
         conn.close()
 
     # ── Summary ───────────────────────────────────────────────────────
-    print(f"""
-{'=' * 60}
-  SYNC COMPLETE
-  Attendance : {att_count} records ({from_date} → {to_date})
-  Leaves     : {leave_count} records
-  PostgreSQL : {pg_count} upserted
-  SQLite     : {db_path}
-{'=' * 60}
-""")
+    _banner(
+        "  SYNC COMPLETE",
+        f"  Attendance : {att_count} records ({from_date} → {to_date})",
+        f"  Leaves     : {leave_count} records",
+        f"  PostgreSQL : {pg_count} upserted",
+        f"  SQLite     : {db_path}",
+    )
 
 
 if __name__ == "__main__":
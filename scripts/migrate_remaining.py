@@ -21,15 +21,18 @@ Requires KEKA_API_KEY, KEKA_CLIENT_ID, KEKA_CLIENT_SECRET in .env
 """
 
 import argparse
+import functools
+import hashlib
 import json
 import logging
 import os
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # ── Path setup ────────────────────────────────────────────────────────
 SCRIPT_DIR = Path(__file__).resolve().parent
@@ -43,7 +46,8 @@ for env_path in [PROJECT_ROOT / ".env", WORKSPACE_ROOT / ".env"]:
     if env_path.exists():
         load_dotenv(env_path)
 
-from migration.config import get_pg_conn, get_sqlite_conn, SQLITE_PATH
+from migration.config import get_pg_conn, get_sqlite_conn
+from migration.pg_copy import copy_rows
 
 logging.basicConfig(
     level=logging.INFO,
@@ -58,8 +62,12 @@ IST = timezone(timedelta(hours=5, minutes=30))
 # Step 1: Keka API Sync (for entities with empty tables)
 # ═════════════════════════════════════════════════════════════════════
 
-def sync_from_keka():
-    """Sync salaries, helpdesk, expenses, FnF, holidays from Keka API → SQLite."""
+def sync_from_keka(on_synced: Optional[Callable[[str], None]] = None):
+    """Sync salaries, helpdesk, expenses, FnF, holidays from Keka API → SQLite.
+
+    ``on_synced(entity)`` is called from the worker thread as soon as an
+    entity's sync succeeds, so follow-up work can start early.
+    """
     from migration.keka_api_sync import KekaApiSyncer
 
     syncer = KekaApiSyncer()
@@ -74,31 +82,60 @@ def sync_from_keka():
         ("leave_balances", syncer.sync_leave_balances),
     ]
 
-    for name, sync_fn in entities:
+    # Holidays use a custom endpoint but run alongside the rest
+    entities.append(("holidays", lambda: sync_holidays_from_keka(syncer)))
+
+    def _run(entity):
+        name, sync_fn = entity
         try:
             count = sync_fn()
-            results[name] = count
             logger.info("✅ %s: %d records", name, count)
         except Exception as e:
-            results[name] = f"ERROR: {e}"
             logger.error("❌ %s: %s", name, e)
+            return f"ERROR: {e}"
+        if on_synced:
+            on_synced(name)
+        return count
 
-    # Sync holidays separately (custom endpoint)
-    try:
-        count = sync_holidays_from_keka(syncer)
-        results["holidays"] = count
-        logger.info("✅ holidays: %d records", count)
-    except Exception as e:
-        results["holidays"] = f"ERROR: {e}"
-        logger.error("❌ holidays: %s", e)
+    with ThreadPoolExecutor(max_workers=syncer.ENTITY_WORKERS) as pool:
+        for (name, _), result in zip(entities, pool.map(_run, entities), strict=True):
+            results[name] = result
 
     return results
 
 
+HOLIDAY_TYPE_MAP = {0: "public", 1: "restricted", 2: "optional"}
+OPTIONAL_TYPES = frozenset(("restricted", "optional"))
+# Holidays without a Keka id get a stable id derived from (name, date)
+HOLIDAY_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "keka:holiday")
+
+
+def _norm_holiday(h: Dict[str, Any], now: str) -> Tuple:
+    """Normalise one Keka holiday payload into a SQLite holidays row."""
+    get = h.get
+    h_name = get("name") or get("title", "")
+    h_date = get("date") or get("holidayDate", "")
+    if isinstance(h_date, str) and "T" in h_date:
+        h_date = h_date[:10]
+    h_type = get("type") or get("holidayType", "public")
+    if isinstance(h_type, int):
+        h_type = HOLIDAY_TYPE_MAP.get(h_type, "public")
+    is_optional = get("isOptional")
+    if is_optional is None:
+        is_optional = h_type in OPTIONAL_TYPES
+    return (
+        get("id") or str(uuid.uuid5(HOLIDAY_ID_NAMESPACE, f"{h_name}|{h_date}")),
+        h_name,
+        h_date,
+        h_type,
+        is_optional,
+        json.dumps(get("applicableLocations", []), separators=(",", ":"), ensure_ascii=False),
+        now,
+    )
+
+
 def sync_holidays_from_keka(syncer=None) -> int:
     """Sync holidays from Keka API → SQLite."""
-    import sqlite3
-
     if syncer is None:
         from migration.keka_api_sync import KekaApiSyncer
         syncer = KekaApiSyncer()
@@ -106,7 +143,7 @@ def sync_holidays_from_keka(syncer=None) -> int:
     logger.info("Syncing holidays from Keka API...")
 
     # Ensure holidays table exists in SQLite
-    conn = sqlite3.connect(SQLITE_PATH)
+    conn = syncer._conn()
     conn.execute("""
         CREATE TABLE IF NOT EXISTS holidays (
             id TEXT PRIMARY KEY,
@@ -118,21 +155,64 @@ def sync_holidays_from_keka(syncer=None) -> int:
             synced_at TEXT
         )
     """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS endpoint_cache (
+            key TEXT PRIMARY KEY,
+            url TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            body_hash TEXT,
+            fetched_at TEXT
+        )
+    """)
     conn.commit()
 
     now = datetime.now(IST).isoformat()
 
-    # Try different Keka holiday endpoints
+    # Reuse the endpoint found last time and let Keka answer 304 if unchanged
     data = []
-    for path in ["/time/holidays", "/hris/holidays", "/holidays"]:
+    found = etag = last_modified = body_hash = None
+    cached = conn.execute(
+        "SELECT url, etag, last_modified, body_hash FROM endpoint_cache WHERE key = 'holidays'"
+    ).fetchone()
+    if cached:
+        found, etag, last_modified, body_hash = cached
+        # Year-scoped endpoints are cached as "<path>?year" and asked for this year
+        path, by_year, _ = found.partition("?year")
+        params = ({"year": datetime.now().year} if by_year
+                  else {"pageSize": 100, "pageNumber": 1})
         try:
-            result = syncer._get_paginated(path)
-            if result:
-                data = result
-                logger.info("Found holidays at %s", path)
-                break
-        except Exception:
-            continue
+            resp = syncer._get_conditional(path, params, etag, last_modified)
+        except Exception as e:
+            logger.warning("Cached holidays endpoint %s failed (%s) — re-probing", found, e)
+            found = None
+        else:
+            if resp is None:
+                count = conn.execute("SELECT COUNT(*) FROM holidays").fetchone()[0]
+                conn.close()
+                logger.info("Holidays unchanged since last sync (%d cached)", count)
+                return count
+            body, etag, last_modified = resp
+            if isinstance(body, list):
+                data = body
+            elif not by_year and syncer._total_pages(body) > 1:
+                data = syncer._get_paginated(path)
+            else:
+                data = syncer._page_records(body)
+
+    if found is None:
+        etag = last_modified = None
+        # Try different Keka holiday endpoints
+        for path in ["/time/holidays", "/hris/holidays", "/holidays"]:
+            try:
+                result = syncer._get_paginated(path)
+                if result:
+                    data = result
+                    found = path
+                    logger.info("Found holidays at %s", path)
+                    break
+            except Exception:
+                continue
 
     if not data:
         # Try year-specific endpoint
@@ -145,34 +225,53 @@ def sync_holidays_from_keka(syncer=None) -> int:
                 elif isinstance(result, dict):
                     data = result.get("data", result.get("values", []))
                 if data:
+                    found = path.split("=")[0]
+                    etag = last_modified = None
                     logger.info("Found holidays at %s", path)
                     break
             except Exception:
                 continue
 
-    count = 0
-    for h in data:
-        h_id = h.get("id", str(uuid.uuid4()))
-        h_name = h.get("name", h.get("title", ""))
-        h_date = h.get("date", h.get("holidayDate", ""))
-        if isinstance(h_date, str) and "T" in h_date:
-            h_date = h_date[:10]
-        h_type = h.get("type", h.get("holidayType", "public"))
-        if isinstance(h_type, int):
-            h_type = {0: "public", 1: "restricted", 2: "optional"}.get(h_type, "public")
-        is_optional = h.get("isOptional", h_type in ("restricted", "optional"))
-        locations = json.dumps(h.get("applicableLocations", []))
-
-        conn.execute(
+    new_hash = syncer._payload_hash(data)
+
+    def _save_endpoint_cache():
+        # Only ever called once the holidays it describes are stored
+        if found:
+            conn.execute(
+                """INSERT OR REPLACE INTO endpoint_cache
+                   (key, url, etag, last_modified, body_hash, fetched_at)
+                   VALUES ('holidays', ?, ?, ?, ?, ?)""",
+                (found, etag, last_modified, new_hash, now),
+            )
+
+    if data and new_hash == body_hash:
+        # Rows from the previous sync are already in place; just refresh validators
+        _save_endpoint_cache()
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM holidays").fetchone()[0]
+        conn.close()
+        logger.info("Holidays payload unchanged (%d cached)", count)
+        return count
+
+    rows = [_norm_holiday(h, now) for h in data]
+
+    # Rows and the ETag/hash that vouches for them commit (or roll back) together
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(
             """INSERT OR REPLACE INTO holidays
                (id, name, date, type, is_optional, applicable_locations, synced_at)
                VALUES (?,?,?,?,?,?,?)""",
-            (h_id, h_name, h_date, h_type, is_optional, locations, now),
+            rows,
         )
-        count += 1
-
+        _save_endpoint_cache()
+    except Exception:
+        conn.rollback()
+        conn.close()
+        raise
     conn.commit()
     conn.close()
+    count = len(rows)
     logger.info("Synced %d holidays to SQLite", count)
     return count
 
@@ -181,16 +280,16 @@ def sync_holidays_from_keka(syncer=None) -> int:
 # Step 2: SQLite → PostgreSQL Migration
 # ═════════════════════════════════════════════════════════════════════
 
+@functools.lru_cache(maxsize=1)
 def get_employee_map() -> Dict[str, uuid.UUID]:
-    """Build {keka_id → pg_uuid} map from employees table."""
+    """Build {keka_id → pg_uuid} map from employees table (once per run)."""
     pg = get_pg_conn()
-    cur = pg.cursor()
-    cur.execute("SELECT id, keka_id FROM employees WHERE keka_id IS NOT NULL")
-    result = {}
-    for row in cur.fetchall():
-        result[str(row[1])] = uuid.UUID(str(row[0]))
-    pg.close()
-    return result
+    try:
+        cur = pg.cursor()
+        cur.execute("SELECT id, keka_id FROM employees WHERE keka_id IS NOT NULL")
+        return {str(keka_id): uuid.UUID(str(pg_id)) for pg_id, keka_id in cur}
+    finally:
+        pg.close()
 
 
 def migrate_salaries_to_pg(emp_map: Dict[str, uuid.UUID]) -> int:
@@ -233,71 +332,126 @@ def migrate_fnf_to_pg(emp_map: Dict[str, uuid.UUID]) -> int:
         return 0
 
 
+_HOLIDAY_COLUMNS = "name, date, type, is_optional, applicable_locations, year"
+
+
+_PG_HOLIDAYS_DDL = """
+    CREATE TABLE IF NOT EXISTS holidays (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        name VARCHAR(255) NOT NULL,
+        date DATE NOT NULL,
+        type VARCHAR(50) DEFAULT 'public',
+        is_optional BOOLEAN DEFAULT FALSE,
+        applicable_locations JSONB DEFAULT '[]'::jsonb,
+        year INTEGER,
+        created_at TIMESTAMPTZ DEFAULT NOW(),
+        updated_at TIMESTAMPTZ DEFAULT NOW(),
+        UNIQUE(name, date)
+    )
+"""
+
+
 def migrate_holidays_to_pg() -> int:
     """Migrate holidays from SQLite → PostgreSQL."""
     import sqlite3
 
     sq = get_sqlite_conn()
-    pg = get_pg_conn()
-    cur = pg.cursor()
-
-    # Ensure holidays table exists in PG
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS holidays (
-            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-            name VARCHAR(255) NOT NULL,
-            date DATE NOT NULL,
-            type VARCHAR(50) DEFAULT 'public',
-            is_optional BOOLEAN DEFAULT FALSE,
-            applicable_locations JSONB DEFAULT '[]'::jsonb,
-            year INTEGER,
-            created_at TIMESTAMPTZ DEFAULT NOW(),
-            updated_at TIMESTAMPTZ DEFAULT NOW(),
-            UNIQUE(name, date)
-        )
-    """)
-    pg.commit()
-
     try:
-        rows = sq.execute("SELECT * FROM holidays").fetchall()
+        rows = sq.execute(
+            "SELECT name, date, type, is_optional, applicable_locations FROM holidays"
+        )
+        # Last row wins per (name, date): one INSERT … ON CONFLICT cannot
+        # touch the same target row twice.
+        staged = {}
+        for h_name, h_date, h_type, is_optional, locations in rows:
+            h_type = h_type or "public"
+            is_optional = bool(is_optional)
+            locations = locations or "[]"
+            year = None
+            if h_date:
+                try:
+                    year = int(h_date[:4])
+                except (ValueError, TypeError):
+                    pass
+            staged[(h_name, h_date)] = (h_name, h_date, h_type, is_optional, locations, year)
     except sqlite3.OperationalError:
         logger.warning("No holidays table in SQLite")
-        sq.close()
-        pg.close()
         return 0
+    finally:
+        sq.close()
 
-    count = 0
-    for r in rows:
-        h_date = r["date"]
-        h_name = r["name"]
-        h_type = r["type"] or "public"
-        is_optional = bool(r["is_optional"])
-        locations = r.get("applicable_locations", "[]")
-        year = None
-        if h_date:
-            try:
-                year = int(h_date[:4])
-            except (ValueError, TypeError):
-                pass
-
-        cur.execute(
-            """INSERT INTO holidays (name, date, type, is_optional, applicable_locations, year)
-               VALUES (%s, %s, %s, %s, %s::jsonb, %s)
-               ON CONFLICT (name, date) DO UPDATE
-               SET type = EXCLUDED.type,
-                   is_optional = EXCLUDED.is_optional,
-                   applicable_locations = EXCLUDED.applicable_locations""",
-            (h_name, h_date, h_type, is_optional, locations, year),
-        )
-        count += 1
+    # Fingerprint of the SQLite side; PG remembers the last one it loaded
+    source_hash = hashlib.blake2b(
+        repr(sorted(staged.values())).encode(), digest_size=16
+    ).hexdigest()
 
-    pg.commit()
-    sq.close()
-    pg.close()
+    pg = get_pg_conn()
+    try:
+        # Single transaction: table check, staging COPY and upsert commit together
+        with pg:
+            cur = pg.cursor()
+            cur.execute("SELECT to_regclass('holidays'), to_regclass('sync_state')")
+            has_holidays, has_sync_state = cur.fetchone()
+            if has_holidays is None:
+                cur.execute(_PG_HOLIDAYS_DDL)
+            if has_sync_state is None:
+                logger.warning("No sync_state table in PostgreSQL (run alembic upgrade) "
+                               "— reloading holidays without change tracking")
+            elif has_holidays is not None:
+                cur.execute(
+                    "SELECT source_hash, rows FROM sync_state WHERE entity = 'holidays'"
+                )
+                last = cur.fetchone()
+                if last and last[0] == source_hash:
+                    # Same source, but only trust it if PG still holds what was loaded
+                    cur.execute("SELECT COUNT(*) FROM holidays")
+                    if cur.fetchone()[0] == last[1]:
+                        logger.info("Holidays in PostgreSQL are up-to-date (%d)", last[1])
+                        return last[1]
+
+            buf = copy_rows(staged.values())
+            cur.execute(
+                "CREATE TEMP TABLE holidays_stage (LIKE holidays INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            cur.copy_expert(
+                f"COPY holidays_stage ({_HOLIDAY_COLUMNS}) FROM STDIN WITH (FORMAT text)", buf
+            )
+            cur.execute(
+                f"""INSERT INTO holidays ({_HOLIDAY_COLUMNS})
+                    SELECT {_HOLIDAY_COLUMNS} FROM holidays_stage
+                    ON CONFLICT (name, date) DO UPDATE
+                    SET type = EXCLUDED.type,
+                        is_optional = EXCLUDED.is_optional,
+                        applicable_locations = EXCLUDED.applicable_locations"""
+            )
+            if has_sync_state is not None:
+                cur.execute(
+                    """INSERT INTO sync_state (entity, source_hash, rows, updated_at)
+                       VALUES ('holidays', %s, %s, NOW())
+                       ON CONFLICT (entity) DO UPDATE
+                       SET source_hash = EXCLUDED.source_hash,
+                           rows = EXCLUDED.rows,
+                           updated_at = EXCLUDED.updated_at""",
+                    (source_hash, len(staged)),
+                )
+    finally:
+        pg.close()
+
+    count = len(staged)
     logger.info("Migrated %d holidays to PostgreSQL", count)
     return count
 
 
+# Synced Keka entity → (result key, SQLite → PG step), in reporting order
+PG_MIGRATIONS = {
+    "salaries": ("salaries", migrate_salaries_to_pg),
+    "helpdesk_tickets": ("helpdesk", migrate_helpdesk_to_pg),
+    "expense_claims": ("expenses", migrate_expenses_to_pg),
+    "fnf_settlements": ("fnf", migrate_fnf_to_pg),
+    "holidays": ("holidays", lambda emp_map: migrate_holidays_to_pg()),
+}
+
+
 def fix_leave_types_and_remigrate(emp_map: Dict[str, uuid.UUID]) -> Tuple[int, int, int]:
     """Add missing leave types and re-migrate previously dropped balances."""
     from migration.fix_leave_types import fix_leave_types
@@ -323,27 +477,33 @@ def show_status():
         "helpdesk_tickets", "expense_claims", "fnf_settlements",
     ]
 
-    # Check if holidays table exists
-    cur.execute("""
-        SELECT EXISTS (
-            SELECT FROM information_schema.tables
-            WHERE table_name = 'holidays'
-        )
-    """)
-    if cur.fetchone()[0]:
+    # One catalog read for which tables exist, then every exact count in one
+    # round trip (planner estimates lag right after this script's bulk COPYs)
+    cur.execute(
+        "SELECT relname FROM pg_stat_user_tables WHERE relname = ANY(%s)",
+        (tables + ["holidays"],),
+    )
+    existing = {row[0] for row in cur.fetchall()}
+    if "holidays" in existing:
         tables.append("holidays")
 
+    present = [t for t in tables if t in existing]
+    counts = {}
+    if present:
+        cur.execute(" UNION ALL ".join(
+            f"SELECT '{t}', COUNT(*) FROM {t}" for t in present
+        ))
+        counts = dict(cur.fetchall())
+
     print(f"\n{'Table':<25} {'Count':>10}")
     print("─" * 40)
     for table in tables:
-        try:
-            cur.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cur.fetchone()[0]
-            status = "⚠️  EMPTY" if count == 0 else ""
-            print(f"  {table:<23} {count:>8}  {status}")
-        except Exception:
+        if table not in existing:
             print(f"  {table:<23} {'N/A':>8}  (table missing)")
-            pg.rollback()
+            continue
+        count = counts[table]
+        status = "⚠️  EMPTY" if count == 0 else ""
+        print(f"  {table:<23} {count:>8}  {status}")
 
     pg.close()
 
@@ -376,60 +536,79 @@ def main():
     print("  HR INTELLIGENCE v2 — REMAINING DATA MIGRATION")
     print(f"{'═' * 60}\n")
 
-    # ── Step 1: Sync from Keka API ────────────────────────────────
-    if not args.migrate_only:
+    # A full run overlaps the two steps: each entity's PG migration starts
+    # as soon as its Keka sync lands instead of after every sync finishes.
+    pg_pool = None
+    if not (args.migrate_only or args.sync_only or args.holidays or args.fix_leaves):
+        try:
+            if get_employee_map():
+                pg_pool = ThreadPoolExecutor(max_workers=2)
+        except Exception as e:
+            logger.warning("PostgreSQL not ready, migrating after sync: %s", e)
+    pg_jobs: Dict[str, Any] = {}
+
+    def _start_pg_migration(entity: str):
+        if entity in PG_MIGRATIONS:
+            key, migrate_fn = PG_MIGRATIONS[entity]
+            pg_jobs[key] = pg_pool.submit(migrate_fn, get_employee_map())
+
+    try:
+        # ── Step 1: Sync from Keka API ────────────────────────────────
+        if not args.migrate_only:
+            print(f"\n{'─' * 40}")
+            print("  STEP 1: Keka API → SQLite Sync")
+            print(f"{'─' * 40}\n")
+
+            if args.holidays:
+                count = sync_holidays_from_keka()
+                print(f"  Holidays synced: {count}")
+            else:
+                results = sync_from_keka(_start_pg_migration if pg_pool else None)
+                print(f"\n  {'Entity':<25} {'Records'}")
+                print("  " + "─" * 40)
+                for entity, count in results.items():
+                    status = "✅" if isinstance(count, int) else "❌"
+                    print(f"  {status} {entity:<23} {count}")
+
+            if args.sync_only:
+                print("\n  Done (sync only mode).")
+                return
+
+        # ── Step 2: SQLite → PostgreSQL ───────────────────────────────
         print(f"\n{'─' * 40}")
-        print("  STEP 1: Keka API → SQLite Sync")
+        print("  STEP 2: SQLite → PostgreSQL Migration")
         print(f"{'─' * 40}\n")
 
-        if args.holidays:
-            count = sync_holidays_from_keka()
-            print(f"  Holidays synced: {count}")
-        else:
-            results = sync_from_keka()
-            print(f"\n  {'Entity':<25} {'Records'}")
-            print("  " + "─" * 40)
-            for entity, count in results.items():
-                status = "✅" if isinstance(count, int) else "❌"
-                print(f"  {status} {entity:<23} {count}")
-
-        if args.sync_only:
-            print("\n  Done (sync only mode).")
-            return
-
-    # ── Step 2: SQLite → PostgreSQL ───────────────────────────────
-    print(f"\n{'─' * 40}")
-    print("  STEP 2: SQLite → PostgreSQL Migration")
-    print(f"{'─' * 40}\n")
-
-    emp_map = get_employee_map()
-    if not emp_map:
-        logger.error("No employee mapping found — run employee migration first")
-        sys.exit(1)
-    print(f"  Employee map: {len(emp_map)} employees")
+        emp_map = get_employee_map()
+        if not emp_map:
+            logger.error("No employee mapping found — run employee migration first")
+            sys.exit(1)
+        print(f"  Employee map: {len(emp_map)} employees")
 
-    results = {}
+        results = {}
 
-    if args.holidays:
-        results["holidays"] = migrate_holidays_to_pg()
-    elif args.fix_leaves:
-        types, bal, req = fix_leave_types_and_remigrate(emp_map)
-        results["leave_types_added"] = types
-        results["leave_balances"] = bal
-        results["leave_requests"] = req
-    else:
-        # Migrate all remaining entities
-        results["salaries"] = migrate_salaries_to_pg(emp_map)
-        results["helpdesk"] = migrate_helpdesk_to_pg(emp_map)
-        results["expenses"] = migrate_expenses_to_pg(emp_map)
-        results["fnf"] = migrate_fnf_to_pg(emp_map)
-        results["holidays"] = migrate_holidays_to_pg()
-
-        # Fix leave types and re-migrate dropped balances
-        types, bal, req = fix_leave_types_and_remigrate(emp_map)
-        results["leave_types_added"] = types
-        results["leave_balances_recovered"] = bal
-        results["leave_requests_recovered"] = req
+        if args.holidays:
+            results["holidays"] = migrate_holidays_to_pg()
+        elif args.fix_leaves:
+            types, bal, req = fix_leave_types_and_remigrate(emp_map)
+            results["leave_types_added"] = types
+            results["leave_balances"] = bal
+            results["leave_requests"] = req
+        else:
+            # Migrate all remaining entities; pipelined ones are already running
+            for key, migrate_fn in PG_MIGRATIONS.values():
+                job = pg_jobs.get(key)
+                results[key] = job.result() if job else migrate_fn(emp_map)
+
+            # Fix leave types and re-migrate dropped balances
+            types, bal, req = fix_leave_types_and_remigrate(emp_map)
+            results["leave_types_added"] = types
+            results["leave_balances_recovered"] = bal
+            results["leave_requests_recovered"] = req
+    finally:
+        # Join in-flight PG migrations even when a sync or migration raised
+        if pg_pool:
+            pg_pool.shutdown(wait=True)
 
     print(f"\n{'─' * 40}")
     print("  RESULTS")
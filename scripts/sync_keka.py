@@ -33,6 +33,7 @@ import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -86,25 +87,31 @@ HOURLY_ENTITIES = [
 ALL_ENTITIES = FREQUENT_ENTITIES + HOURLY_ENTITIES
 
 
-def _should_sync_hourly(syncer: KekaApiSyncer, entity: str) -> bool:
-    """Check if an hourly entity needs syncing (>55 min since last sync)."""
+def _due_hourly_entities(syncer: KekaApiSyncer, now_ist: datetime) -> set[str]:
+    """Return the hourly entities that need syncing (>55 min since last sync)."""
+    placeholders = ",".join("?" * len(HOURLY_ENTITIES))
     try:
         conn = syncer._conn()
-        row = conn.execute(
-            "SELECT value FROM last_sync_meta WHERE key = ?", (entity,)
-        ).fetchone()
+        rows = conn.execute(
+            f"SELECT key, value FROM last_sync_meta WHERE key IN ({placeholders})",
+            HOURLY_ENTITIES,
+        ).fetchall()
         conn.close()
-        if not row:
-            return True
-        info = json.loads(row["value"])
-        last_sync = info.get("last_sync", "")
-        if not last_sync:
-            return True
-        last_dt = datetime.fromisoformat(last_sync)
-        elapsed = (datetime.now(IST) - last_dt).total_seconds()
-        return elapsed > 55 * 60  # 55 minutes
     except Exception:
-        return True
+        return set(HOURLY_ENTITIES)
+
+    fresh = set()
+    for key, value in rows:
+        try:
+            last_sync = json.loads(value).get("last_sync", "")
+            if not last_sync:
+                continue
+            elapsed = (now_ist - datetime.fromisoformat(last_sync)).total_seconds()
+            if elapsed <= 55 * 60:  # 55 minutes
+                fresh.add(key)
+        except Exception:
+            continue
+    return set(HOURLY_ENTITIES) - fresh
 
 
 def run_sync(
@@ -115,6 +122,7 @@ def run_sync(
 ) -> dict[str, int | str]:
     """Run sync for specified entities (or all). Returns entity→count map."""
     now = datetime.now()
+    now_ist = datetime.now(IST)
     att_from = (now - timedelta(days=3)).strftime("%Y-%m-%d")
     leave_from = (now - timedelta(days=7)).strftime("%Y-%m-%d")
     full_from = (now - timedelta(days=days_back)).strftime("%Y-%m-%d")
@@ -135,6 +143,8 @@ def run_sync(
 
     targets = entities or ALL_ENTITIES
     results: dict[str, int | str] = {}
+    due: list[str] = []
+    hourly_due = _due_hourly_entities(syncer, now_ist) if not entities else set()
 
     for entity in targets:
         if entity not in entity_map:
@@ -144,23 +154,32 @@ def run_sync(
 
         # Skip hourly entities if not due
         if not entities and entity in HOURLY_ENTITIES:
-            if not _should_sync_hourly(syncer, entity):
+            if entity not in hourly_due:
                 logger.info("⏭  %s — skipped (synced <1h ago)", entity)
                 results[entity] = "SKIPPED"
                 continue
 
+        if dry_run:
+            logger.info("[DRY RUN] Would sync %s", entity)
+            results[entity] = "DRY_RUN"
+        else:
+            results[entity] = "PENDING"  # keeps target order in the summary
+            due.append(entity)
+
+    def _run(entity: str) -> int | str:
         try:
-            if dry_run:
-                logger.info("[DRY RUN] Would sync %s", entity)
-                results[entity] = "DRY_RUN"
-            else:
-                fn = entity_map[entity]
-                count = fn()
-                results[entity] = count
-                logger.info("✅ %s: %d records", entity, count)
+            count = entity_map[entity]()
+            logger.info("✅ %s: %d records", entity, count)
+            return count
         except Exception as e:
-            results[entity] = f"ERROR: {e}"
             logger.error("❌ %s: %s", entity, e)
+            return f"ERROR: {e}"
+
+    # Entities are independent and network-bound; overlap their API calls
+    if due:
+        with ThreadPoolExecutor(max_workers=syncer.ENTITY_WORKERS) as pool:
+            for entity, result in zip(due, pool.map(_run, due), strict=True):
+                results[entity] = result
 
     return results
 
@@ -7,29 +7,46 @@ Uses SQLite + aiosqlite for fast isolated tests without PostgreSQL.
 from __future__ import annotations
 
 import os
+import sys
 
 # Set test JWT_SECRET before any other import touches pydantic-settings
 os.environ.setdefault("JWT_SECRET", "test-secret-for-ci-do-not-use-in-production")
 
+import asyncio
+import base64
+import contextlib
+import functools
 import hashlib
+import hmac
+import json
+import secrets
 import uuid
 from datetime import date, datetime, timedelta, timezone
 from typing import AsyncGenerator
 from unittest.mock import AsyncMock, patch
 
 import pytest
+import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from jose import jwt
 from sqlalchemy import event, text
+from sqlalchemy.dialects.postgresql import INET, JSONB, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import configure_mappers
 from sqlalchemy.pool import StaticPool
 
+import backend.auth.router
+from backend.auth.dependencies import hash_token
+from backend.auth.models import UserSession
 from backend.common.constants import UserRole
+from backend.common.rate_limit import limiter
 from backend.config import settings
+from backend.core_hr.models import Department, Employee, Location
 from backend.database import Base, get_db
 from backend.main import create_app
 
@@ -45,16 +62,21 @@ import backend.salary.models  # noqa: F401
 import backend.helpdesk.models  # noqa: F401
 import backend.expenses.models  # noqa: F401
 import backend.fnf.models  # noqa: F401
-import backend.salary.models  # noqa: F401
-import backend.helpdesk.models  # noqa: F401
-import backend.expenses.models  # noqa: F401
-import backend.fnf.models  # noqa: F401
 
-# ── SQLite compat: compile PG-specific types to TEXT/BLOB ───────────
+# Optional: uvloop gives a faster event loop (not available on Windows)
+uvloop = None
+if sys.platform != "win32":
+    with contextlib.suppress(ImportError):
+        import uvloop
 
-from sqlalchemy.dialects.postgresql import INET, JSONB, UUID as PG_UUID
-from sqlalchemy.ext.compiler import compiles
+# Resolve the whole mapper graph now rather than lazily inside the first test
+configure_mappers()
+
+# Rate limiting is off for the session; TestRateLimiting re-enables it
+# (and resets its storage) only for the tests that exercise it.
+limiter.enabled = False
 
+# ── SQLite compat: compile PG-specific types to TEXT/BLOB ───────────
 
 @compiles(JSONB, "sqlite")
 def _jsonb_sqlite(element, compiler, **kw):
@@ -96,33 +118,63 @@ def _register_sqlite_functions(dbapi_conn, connection_record):
     dbapi_conn.create_function(
         "gen_random_uuid", 0, lambda: str(uuid.uuid4()),
     )
+    # Let SQLAlchemy emit BEGIN itself; pysqlite's implicit transactions
+    # break the SAVEPOINTs each test's rollback relies on.
+    dbapi_conn.isolation_level = None
+
+
+@event.listens_for(engine.sync_engine, "begin")
+def _sqlite_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 
 TestSessionFactory = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False,
 )
 
 
-@pytest.fixture(autouse=True)
-async def _setup_db():
-    """Create all tables before each test, drop after."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+_schema_created = False
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the one session-scoped event loop."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run every async test and fixture on uvloop when it is installed."""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.get_event_loop_policy()
 
 
 @pytest.fixture(autouse=True)
-def _reset_rate_limiter():
-    """Reset rate limiter storage between tests to prevent cross-test interference."""
-    from backend.common.rate_limit import limiter
-    try:
-        # Clear the in-memory storage used by slowapi/limits
-        if hasattr(limiter, '_storage'):
-            limiter._storage.reset()
-    except Exception:
-        pass
-    yield
+async def _setup_db():
+    """Run each test inside an outer transaction that is rolled back after.
+
+    The schema is created once; StaticPool keeps the in-memory database
+    alive between tests. Every session from TestSessionFactory (including
+    the app's get_db override) joins the test's connection, and its
+    commits become SAVEPOINT releases inside the outer transaction.
+    """
+    global _schema_created
+    if not _schema_created:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        _schema_created = True
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        TestSessionFactory.configure(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield
+        finally:
+            TestSessionFactory.configure(bind=engine, join_transaction_mode="conservative_savepoint")
+            await trans.rollback()
 
 
 async def _override_get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -139,25 +191,48 @@ async def _override_get_db() -> AsyncGenerator[AsyncSession, None]:
 
 # ── FastAPI test client ─────────────────────────────────────────────
 
-@pytest.fixture
-async def app():
-    """Create a fresh app instance with DB dependency overridden."""
-    application = create_app()
-    application.dependency_overrides[get_db] = _override_get_db
-    yield application
-    application.dependency_overrides.clear()
+@pytest.fixture(scope="session")
+def _application():
+    """Build the FastAPI app once — route and middleware setup is the slow part."""
+    return create_app()
 
 
 @pytest.fixture
-async def client(app) -> AsyncGenerator[AsyncClient, None]:
-    """Async HTTP client wired to the test app."""
+async def app(_application):
+    """The shared app instance with DB dependency overridden for this test.
+
+    Overrides are restored to their pre-test snapshot, so anything set at
+    session level survives while per-test overrides are discarded.
+    """
+    overrides = _application.dependency_overrides
+    saved = dict(overrides)
+    overrides[get_db] = _override_get_db
+    yield _application
+    overrides.clear()
+    overrides.update(saved)
+
+
+@pytest.fixture(scope="session")
+async def _shared_client(_application) -> AsyncGenerator[AsyncClient, None]:
+    """One AsyncClient + ASGITransport for the whole session."""
     async with AsyncClient(
-        transport=ASGITransport(app=app),
+        transport=ASGITransport(app=_application),
         base_url="http://test",
     ) as ac:
         yield ac
 
 
+@pytest.fixture
+def client(app, _shared_client) -> AsyncClient:
+    """Async HTTP client wired to the test app.
+
+    Depends on ``app`` so the per-test get_db override is installed; the
+    database state itself is isolated by _setup_db's rollback.
+    """
+    _shared_client.cookies.clear()
+    return _shared_client
+
+
 # ── Database session (for direct DB operations in tests) ────────────
 
 @pytest.fixture
@@ -175,6 +250,7 @@ def _make_location(
     city: str = "Mumbai",
     state: str = "Maharashtra",
 ) -> dict:
+    now = datetime.now(timezone.utc)
     return dict(
         id=uuid.uuid4(),
         name=name,
@@ -182,8 +258,8 @@ def _make_location(
         state=state,
         timezone="Asia/Kolkata",
         is_active=True,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
+        created_at=now,
+        updated_at=now,
     )
 
 
@@ -193,14 +269,15 @@ def _make_department(
     code: str = "ENG",
     location_id: uuid.UUID | None = None,
 ) -> dict:
+    now = datetime.now(timezone.utc)
     return dict(
         id=uuid.uuid4(),
         name=name,
         code=code,
         location_id=location_id,
         is_active=True,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
+        created_at=now,
+        updated_at=now,
     )
 
 
@@ -212,9 +289,10 @@ def _make_employee(
     department_id: uuid.UUID | None = None,
     location_id: uuid.UUID | None = None,
 ) -> dict:
+    now = datetime.now(timezone.utc)
     return dict(
         id=uuid.uuid4(),
-        employee_code=f"CF-{uuid.uuid4().hex[:6].upper()}",
+        employee_code=f"CF-{secrets.token_hex(3).upper()}",
         first_name=first_name,
         last_name=last_name,
         email=email,
@@ -225,66 +303,92 @@ def _make_employee(
         department_id=department_id,
         location_id=location_id,
         is_active=True,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
+        created_at=now,
+        updated_at=now,
     )
 
 
 @pytest.fixture
-async def test_location(db) -> dict:
-    """Insert a test location and return its data dict."""
-    from backend.core_hr.models import Location
-
-    data = _make_location()
-    db.add(Location(**data))
+async def test_org_graph(db) -> dict[str, dict]:
+    """Insert location → department → employee with a single flush."""
+    location = _make_location()
+    department = _make_department(location_id=location["id"])
+    employee = _make_employee(
+        department_id=department["id"],
+        location_id=location["id"],
+    )
+    db.add_all([
+        Location(**location),
+        Department(**department),
+        Employee(**employee),
+    ])
     await db.flush()
-    return data
+    return {"location": location, "department": department, "employee": employee}
 
 
 @pytest.fixture
-async def test_department(db, test_location) -> dict:
-    """Insert a test department linked to test_location."""
-    from backend.core_hr.models import Department
-
-    data = _make_department(location_id=test_location["id"])
-    db.add(Department(**data))
-    await db.flush()
-    return data
+def test_location(test_org_graph) -> dict:
+    """The test location's data dict."""
+    return test_org_graph["location"]
 
 
 @pytest.fixture
-async def test_employee(db, test_department, test_location) -> dict:
-    """Insert an active employee with department + location."""
-    from backend.core_hr.models import Employee
+def test_department(test_org_graph) -> dict:
+    """The test department (linked to test_location)."""
+    return test_org_graph["department"]
 
-    data = _make_employee(
-        department_id=test_department["id"],
-        location_id=test_location["id"],
-    )
-    db.add(Employee(**data))
-    await db.flush()
-    return data
+
+@pytest.fixture
+def test_employee(test_org_graph) -> dict:
+    """The active test employee with department + location."""
+    return test_org_graph["employee"]
 
 
 # ── Auth helpers ────────────────────────────────────────────────────
 
+# Read once: settings is a pydantic BaseSettings and no test overrides these.
+_JWT_SECRET = settings.JWT_SECRET
+_JWT_ALG = settings.JWT_ALGORITHM
+_JWT_EXPIRY = timedelta(hours=settings.JWT_EXPIRY_HOURS)
+
+
+def _b64url(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+_JWT_KEY = _JWT_SECRET.encode()
+_JWT_HEADER = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+
+def _jwt_encode(payload: dict) -> str:
+    """Sign an HS256 JWT directly with hmac; other algorithms go via jose."""
+    if _JWT_ALG != "HS256":
+        return jwt.encode(payload, _JWT_SECRET, algorithm=_JWT_ALG)
+    body = _b64url(json.dumps(payload, separators=(",", ":")).encode())
+    signing_input = _JWT_HEADER + b"." + body
+    sig = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(sig)).decode("ascii")
+
+
+@functools.lru_cache(maxsize=512)
+def _encode_access_token(sub: str, role: str, exp_ts: int) -> str:
+    payload = {"sub": sub, "role": role, "type": "access", "exp": exp_ts}
+    return _jwt_encode(payload)
+
+
 def create_access_token(
     employee_id: uuid.UUID,
     role: UserRole = UserRole.employee,
     expired: bool = False,
 ) -> str:
-    """Generate a JWT access token for testing."""
-    if expired:
-        exp = datetime.now(timezone.utc) - timedelta(hours=1)
-    else:
-        exp = datetime.now(timezone.utc) + timedelta(hours=settings.JWT_EXPIRY_HOURS)
-    payload = {
-        "sub": str(employee_id),
-        "role": role.value,
-        "type": "access",
-        "exp": exp,
-    }
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    """Generate a JWT access token for testing.
+
+    ``exp`` is whole seconds (as JWT encodes it anyway), so identical
+    requests within the same second reuse one signed token.
+    """
+    now = datetime.now(timezone.utc)
+    exp = now - timedelta(hours=1) if expired else now + _JWT_EXPIRY
+    return _encode_access_token(str(employee_id), role.value, int(exp.timestamp()))
 
 
 def create_refresh_token(
@@ -300,24 +404,34 @@ def create_refresh_token(
         "sub": str(employee_id),
         "type": "refresh",
         "jti": uuid.uuid4().hex,
-        "exp": exp,
+        "exp": int(exp.timestamp()),
     }
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    return _jwt_encode(payload)
 
 
 @pytest.fixture
-async def auth_headers(db, test_employee) -> dict[str, str]:
-    """Return Bearer auth headers with a valid session persisted in the DB."""
-    from backend.auth.models import UserSession
+def auth_token(test_employee) -> str:
+    """An access token for test_employee (no session row)."""
+    return create_access_token(test_employee["id"])
 
-    token = create_access_token(test_employee["id"])
-    token_hash = hashlib.sha256(token.encode()).hexdigest()
+
+@pytest.fixture
+def auth_headers_no_db(auth_token) -> dict[str, str]:
+    """Bearer headers without a persisted session, for endpoints that skip it."""
+    return {"Authorization": f"Bearer {auth_token}"}
+
+
+@pytest.fixture
+async def auth_headers(db, test_employee, auth_token) -> dict[str, str]:
+    """Return Bearer auth headers with a valid session persisted in the DB."""
+    token = auth_token
+    token_hash = hash_token(token)
 
     session = UserSession(
         id=uuid.uuid4(),
         employee_id=test_employee["id"],
         token_hash=token_hash,
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=settings.JWT_EXPIRY_HOURS),
+        expires_at=datetime.now(timezone.utc) + _JWT_EXPIRY,
         is_revoked=False,
         created_at=datetime.now(timezone.utc),
     )
@@ -327,19 +441,27 @@ async def auth_headers(db, test_employee) -> dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
 
 
+_DEFAULT_GOOGLE_INFO = {
+    "email": "test.user@creativefuel.io",
+    "name": "Test User",
+    "picture": "https://lh3.googleusercontent.com/fake",
+}
+
+
 @pytest.fixture
 def mock_google_oauth():
     """Patch verify_google_token to return a fake Creativefuel user."""
 
-    def _mock(email: str = "test.user@creativefuel.io", name: str = "Test User"):
+    def _mock(**overrides):
         google_info = {
-            "email": email,
-            "name": name,
-            "picture": "https://lh3.googleusercontent.com/fake",
+            **_DEFAULT_GOOGLE_INFO,
             "google_id": f"google-{uuid.uuid4().hex[:12]}",
+            **overrides,
         }
-        return patch(
-            "backend.auth.router.verify_google_token",
+        # Patched only for the duration of the caller's ``with`` block
+        return patch.object(
+            backend.auth.router,
+            "verify_google_token",
             new_callable=AsyncMock,
             return_value=google_info,
         )
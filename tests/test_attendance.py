@@ -11,7 +11,8 @@ import uuid
 from datetime import date, datetime, time, timedelta, timezone
 from unittest.mock import patch
 
-from sqlalchemy import select
+import pytest
+from sqlalchemy import bindparam, insert, select
 
 from backend.attendance.models import (
     AttendanceRecord,
@@ -24,19 +25,35 @@ from backend.attendance.models import (
     WeeklyOffPolicy,
 )
 from backend.attendance.service import AttendanceService
+from backend.auth.dependencies import hash_token
+from backend.auth.models import UserSession
 from backend.common.constants import (
     ArrivalStatus,
     AttendanceStatus,
     RegularizationStatus,
     UserRole,
 )
+from backend.common.exceptions import (
+    ConflictError,
+    NotFoundException,
+    ValidationException,
+)
+from backend.config import settings
 from backend.core_hr.models import Employee
+from backend.leave.service import LeaveService
 from tests.conftest import (
     TestSessionFactory,
     _make_employee,
     create_access_token,
 )
 
+# Verification queries, built once and reused across tests
+_SEL_ATT_BY_EMP = select(AttendanceRecord).where(
+    AttendanceRecord.employee_id == bindparam("eid"),
+)
+_SEL_ATT_BY_ID = select(AttendanceRecord).where(AttendanceRecord.id == bindparam("aid"))
+_SEL_ENTRY_BY_EMP = select(ClockEntry).where(ClockEntry.employee_id == bindparam("eid"))
+
 # ── Helpers ─────────────────────────────────────────────────────────
 
 
@@ -84,11 +101,25 @@ async def _assign_shift(db, employee_id, shift_id, weekly_off_id,
     return assignment
 
 
+async def _bulk_seed_attendance(db, employee_id, dates,
+                                status=AttendanceStatus.present) -> None:
+    """Insert one full-day AttendanceRecord per date via a bulk INSERT."""
+    await db.execute(insert(AttendanceRecord), [
+        {
+            "employee_id": employee_id,
+            "date": d,
+            "status": status,
+            "total_work_minutes": 510,
+            "effective_work_minutes": 450,
+            "source": "test",
+        }
+        for d in dates
+    ])
+    await db.flush()
+
+
 async def _create_manager_with_report(db, test_location, test_department):
     """Create a manager and a direct report. Return (manager_data, report_data)."""
-    from backend.auth.models import UserSession
-    import hashlib
-
     manager_data = _make_employee(
         email="manager@creativefuel.io",
         first_name="Manager",
@@ -96,9 +127,6 @@ async def _create_manager_with_report(db, test_location, test_department):
         department_id=test_department["id"],
         location_id=test_location["id"],
     )
-    db.add(Employee(**manager_data))
-    await db.flush()
-
     report_data = _make_employee(
         email="report@creativefuel.io",
         first_name="Report",
@@ -109,7 +137,7 @@ async def _create_manager_with_report(db, test_location, test_department):
     # Set reporting_manager_id
     report_obj = Employee(**report_data)
     report_obj.reporting_manager_id = manager_data["id"]
-    db.add(report_obj)
+    db.add_all([Employee(**manager_data), report_obj])
     await db.flush()
     report_data["id"] = report_obj.id
 
@@ -124,18 +152,15 @@ def _make_auth_headers(employee_id, role=UserRole.employee):
 
 async def _persist_session(db, employee_id, token):
     """Create a UserSession row matching the token so auth middleware passes."""
-    import hashlib
-    from backend.auth.models import UserSession
-    from backend.config import settings
-
-    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    token_hash = hash_token(token)
+    now = datetime.now(timezone.utc)
     session = UserSession(
         id=uuid.uuid4(),
         employee_id=employee_id,
         token_hash=token_hash,
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=settings.JWT_EXPIRY_HOURS),
+        expires_at=now + timedelta(hours=settings.JWT_EXPIRY_HOURS),
         is_revoked=False,
-        created_at=datetime.now(timezone.utc),
+        created_at=now,
     )
     db.add(session)
     await db.flush()
@@ -157,10 +182,8 @@ async def test_clock_in_creates_attendance_record(db, test_employee):
 
     # Verify DB state
     record = (await db.execute(
-        select(AttendanceRecord).where(
-            AttendanceRecord.employee_id == test_employee["id"]
-        )
-    )).scalars().first()
+        _SEL_ATT_BY_EMP, {"eid": test_employee["id"]},
+    )).scalar_one_or_none()
     assert record is not None
     assert record.status == AttendanceStatus.present
     assert record.first_clock_in is not None
@@ -170,9 +193,6 @@ async def test_clock_in_duplicate_raises_conflict(db, test_employee):
     """Clocking in twice without clocking out should raise ConflictError."""
     await AttendanceService.clock_in(db, test_employee["id"])
 
-    from backend.common.exceptions import ConflictError
-    import pytest
-
     with pytest.raises(ConflictError):
         await AttendanceService.clock_in(db, test_employee["id"])
 
@@ -214,21 +234,16 @@ async def test_clock_out_records_hours(db, test_employee):
 
     assert clock_out_resp.attendance_id == att.id
 
-    # Reload and verify hours were computed
-    record = (await db.execute(
-        select(AttendanceRecord).where(AttendanceRecord.id == att.id)
-    )).scalars().first()
-    assert record.last_clock_out is not None
-    assert record.total_work_minutes is not None
-    assert record.total_work_minutes > 0
-    assert record.effective_work_minutes is not None
+    # Reload just the columns clock_out writes and verify hours were computed
+    await db.refresh(att, ["last_clock_out", "total_work_minutes", "effective_work_minutes"])
+    assert att.last_clock_out is not None
+    assert att.total_work_minutes is not None
+    assert att.total_work_minutes > 0
+    assert att.effective_work_minutes is not None
 
 
 async def test_clock_out_without_clock_in_raises_validation(db, test_employee):
     """Clock-out with no open clock entry should raise ValidationException."""
-    from backend.common.exceptions import ValidationException
-    import pytest
-
     with pytest.raises(ValidationException):
         await AttendanceService.clock_out(db, test_employee["id"])
 
@@ -238,80 +253,43 @@ async def test_clock_out_without_clock_in_raises_validation(db, test_employee):
 # ═════════════════════════════════════════════════════════════════════
 
 
-async def test_on_time_arrival_within_grace(db, test_employee):
-    """Clock-in within shift start + grace → on_time arrival status."""
-    shift = await _create_shift(db, start=time(9, 0), grace=15)
-    weekly_off = await _create_weekly_off(db)
-    await _assign_shift(db, test_employee["id"], shift.id, weekly_off.id)
-
-    # Clock in at 09:10 — within 15-minute grace
-    fake_now = datetime.combine(
-        date.today(), time(9, 10), tzinfo=timezone.utc,
-    )
-    with patch("backend.attendance.service.datetime") as mock_dt:
-        mock_dt.now.return_value = fake_now
-        mock_dt.combine = datetime.combine
-        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
-        resp = await AttendanceService.clock_in(db, test_employee["id"])
-
-    assert resp.arrival_status == ArrivalStatus.on_time
-
-
-async def test_late_arrival_after_grace(db, test_employee):
-    """Clock-in after grace but within 30 min → late arrival status."""
-    shift = await _create_shift(db, start=time(9, 0), grace=15)
-    weekly_off = await _create_weekly_off(db)
-    await _assign_shift(db, test_employee["id"], shift.id, weekly_off.id)
-
-    # Clock in at 09:25 — 25 min after shift start, past 15-min grace
-    fake_now = datetime.combine(
-        date.today(), time(9, 25), tzinfo=timezone.utc,
-    )
-    with patch("backend.attendance.service.datetime") as mock_dt:
-        mock_dt.now.return_value = fake_now
-        mock_dt.combine = datetime.combine
-        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
-        resp = await AttendanceService.clock_in(db, test_employee["id"])
-
-    assert resp.arrival_status == ArrivalStatus.late
+# A fixed working day (Friday) so late-detection never depends on the host clock
+_FROZEN_DATE = date(2026, 2, 20)
 
 
-async def test_very_late_arrival(db, test_employee):
-    """Clock-in > 30 min after shift start → very_late arrival status."""
-    shift = await _create_shift(db, start=time(9, 0), grace=15)
-    weekly_off = await _create_weekly_off(db)
-    await _assign_shift(db, test_employee["id"], shift.id, weekly_off.id)
-
-    # Clock in at 09:45 — 45 min after shift start
-    fake_now = datetime.combine(
-        date.today(), time(9, 45), tzinfo=timezone.utc,
-    )
-    with patch("backend.attendance.service.datetime") as mock_dt:
+@pytest.fixture
+def frozen_clock(request):
+    """Freeze the attendance service clock at _FROZEN_DATE + ``request.param`` (UTC)."""
+    fake_now = datetime.combine(_FROZEN_DATE, request.param, tzinfo=timezone.utc)
+    with patch("backend.attendance.service.datetime", wraps=datetime) as mock_dt:
         mock_dt.now.return_value = fake_now
-        mock_dt.combine = datetime.combine
-        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
-        resp = await AttendanceService.clock_in(db, test_employee["id"])
-
-    assert resp.arrival_status == ArrivalStatus.very_late
-
-
-async def test_half_day_when_extremely_late(db, test_employee):
-    """Clock-in > 2 hours after shift start → status becomes half_day."""
+        yield mock_dt
+
+
+@pytest.mark.parametrize(
+    "frozen_clock, field, expected",
+    [
+        # 09:10 — within the 15-minute grace
+        (time(9, 10), "arrival_status", ArrivalStatus.on_time),
+        # 09:25 — past grace but within 30 min
+        (time(9, 25), "arrival_status", ArrivalStatus.late),
+        # 09:45 — more than 30 min after shift start
+        (time(9, 45), "arrival_status", ArrivalStatus.very_late),
+        # 11:30 — more than 2 hours late, so the day becomes half_day
+        (time(11, 30), "status", AttendanceStatus.half_day),
+    ],
+    indirect=["frozen_clock"],
+    ids=["on_time", "late", "very_late", "half_day"],
+)
+async def test_arrival_status_by_clock_in_time(db, test_employee, frozen_clock, field, expected):
+    """Clock-in time relative to shift start + grace decides the arrival status."""
     shift = await _create_shift(db, start=time(9, 0), grace=15)
     weekly_off = await _create_weekly_off(db)
     await _assign_shift(db, test_employee["id"], shift.id, weekly_off.id)
 
-    # Clock in at 11:30 — 150 min after shift start (> 120 threshold)
-    fake_now = datetime.combine(
-        date.today(), time(11, 30), tzinfo=timezone.utc,
-    )
-    with patch("backend.attendance.service.datetime") as mock_dt:
-        mock_dt.now.return_value = fake_now
-        mock_dt.combine = datetime.combine
-        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
-        resp = await AttendanceService.clock_in(db, test_employee["id"])
+    resp = await AttendanceService.clock_in(db, test_employee["id"])
 
-    assert resp.status == AttendanceStatus.half_day
+    assert getattr(resp, field) == expected
 
 
 # ═════════════════════════════════════════════════════════════════════
@@ -339,9 +317,6 @@ async def test_submit_regularization(db, test_employee):
 
 async def test_regularization_rejects_future_date(db, test_employee):
     """Regularization for today or future should raise ValidationException."""
-    from backend.common.exceptions import ValidationException
-    import pytest
-
     with pytest.raises(ValidationException):
         await AttendanceService.submit_regularization(
             db,
@@ -354,9 +329,6 @@ async def test_regularization_rejects_future_date(db, test_employee):
 
 async def test_duplicate_pending_regularization_raises_conflict(db, test_employee):
     """Submitting a second pending regularization for the same date → ConflictError."""
-    from backend.common.exceptions import ConflictError
-    import pytest
-
     yesterday = date.today() - timedelta(days=1)
 
     await AttendanceService.submit_regularization(
@@ -377,18 +349,26 @@ async def test_duplicate_pending_regularization_raises_conflict(db, test_employe
         )
 
 
-async def test_approve_regularization(db, test_employee, test_location, test_department):
-    """Approving a regularization updates both the reg status and attendance record."""
-    yesterday = date.today() - timedelta(days=1)
-    manager_data, _ = await _create_manager_with_report(db, test_location, test_department)
+@pytest.fixture
+async def pending_reg(db, test_employee, test_location, test_department):
+    """A pending regularization by test_employee for yesterday, plus a manager.
 
+    Returns ``(reg, manager_data)``; changes are unwound by the test rollback.
+    """
+    manager_data, _ = await _create_manager_with_report(db, test_location, test_department)
     reg = await AttendanceService.submit_regularization(
         db,
         test_employee["id"],
-        target_date=yesterday,
+        target_date=date.today() - timedelta(days=1),
         requested_status=AttendanceStatus.present,
         reason="Was in client meeting, forgot biometric.",
     )
+    return reg, manager_data
+
+
+async def test_approve_regularization(db, pending_reg):
+    """Approving a regularization updates both the reg status and attendance record."""
+    reg, manager_data = pending_reg
 
     approved = await AttendanceService.approve_regularization(
         db, reg.id, manager_data["id"],
@@ -397,28 +377,15 @@ async def test_approve_regularization(db, test_employee, test_location, test_dep
     assert approved.status == RegularizationStatus.approved
     assert approved.reviewed_by == manager_data["id"]
 
-    # Verify attendance record updated
-    att = (await db.execute(
-        select(AttendanceRecord).where(
-            AttendanceRecord.id == reg.attendance_record_id,
-        )
-    )).scalars().first()
+    # Verify attendance record updated (already in the identity map)
+    att = await db.get(AttendanceRecord, reg.attendance_record_id)
     assert att.status == AttendanceStatus.present
     assert att.is_regularized is True
 
 
-async def test_reject_regularization(db, test_employee, test_location, test_department):
+async def test_reject_regularization(db, pending_reg):
     """Rejecting a regularization sets status to rejected with reviewer remarks."""
-    yesterday = date.today() - timedelta(days=1)
-    manager_data, _ = await _create_manager_with_report(db, test_location, test_department)
-
-    reg = await AttendanceService.submit_regularization(
-        db,
-        test_employee["id"],
-        target_date=yesterday,
-        requested_status=AttendanceStatus.present,
-        reason="Was in client meeting, forgot biometric.",
-    )
+    reg, manager_data = pending_reg
 
     rejected = await AttendanceService.reject_regularization(
         db, reg.id, manager_data["id"],
@@ -429,21 +396,9 @@ async def test_reject_regularization(db, test_employee, test_location, test_depa
     assert rejected.reviewer_remarks == "No evidence of office presence found."
 
 
-async def test_cannot_approve_already_approved(db, test_employee, test_location, test_department):
+async def test_cannot_approve_already_approved(db, pending_reg):
     """Approving an already-approved regularization should raise ValidationException."""
-    from backend.common.exceptions import ValidationException
-    import pytest
-
-    yesterday = date.today() - timedelta(days=1)
-    manager_data, _ = await _create_manager_with_report(db, test_location, test_department)
-
-    reg = await AttendanceService.submit_regularization(
-        db,
-        test_employee["id"],
-        target_date=yesterday,
-        requested_status=AttendanceStatus.present,
-        reason="Client meeting off-site, forgot to clock in.",
-    )
+    reg, manager_data = pending_reg
 
     await AttendanceService.approve_regularization(db, reg.id, manager_data["id"])
 
@@ -487,10 +442,8 @@ async def test_today_attendance_shows_all_employees(db, test_employee):
 
     assert result.summary.total_employees >= 1
     # Our test employee should be absent (no clock-in yet)
-    emp_item = next(
-        (i for i in result.data if i.employee.id == test_employee["id"]),
-        None,
-    )
+    by_id = {i.employee.id: i for i in result.data}
+    emp_item = by_id.get(test_employee["id"])
     assert emp_item is not None
     assert emp_item.status == AttendanceStatus.absent
 
@@ -501,10 +454,8 @@ async def test_today_attendance_reflects_clock_in(db, test_employee):
 
     result = await AttendanceService.get_today_attendance(db)
 
-    emp_item = next(
-        (i for i in result.data if i.employee.id == test_employee["id"]),
-        None,
-    )
+    by_id = {i.employee.id: i for i in result.data}
+    emp_item = by_id.get(test_employee["id"])
     assert emp_item is not None
     assert emp_item.status == AttendanceStatus.present
     assert emp_item.first_clock_in is not None
@@ -525,12 +476,13 @@ async def test_team_attendance_returns_direct_reports(
     )
 
     # Create attendance for the report
-    today = date.today()
+    now = datetime.now(timezone.utc)
+    today = now.date()
     att = AttendanceRecord(
         employee_id=report_data["id"],
         date=today,
         status=AttendanceStatus.present,
-        first_clock_in=datetime.now(timezone.utc),
+        first_clock_in=now,
         source="test",
     )
     db.add(att)
@@ -542,7 +494,8 @@ async def test_team_attendance_returns_direct_reports(
     )
 
     assert result.meta.total == 1
-    assert result.data[0].date == today
+    by_id = {r.id: r for r in result.data}
+    assert by_id[att.id].date == today
     assert result.summary.present == 1
 
 
@@ -606,16 +559,12 @@ async def test_get_holidays(db, test_location):
         location_id=test_location["id"],
         is_active=True,
     )
-    db.add(calendar)
-    await db.flush()
-
     holidays = [
-        Holiday(calendar_id=calendar.id, name="Republic Day", date=date(2026, 1, 26)),
-        Holiday(calendar_id=calendar.id, name="Independence Day", date=date(2026, 8, 15)),
-        Holiday(calendar_id=calendar.id, name="Diwali", date=date(2026, 10, 19), is_optional=True),
+        Holiday(calendar=calendar, name="Republic Day", date=date(2026, 1, 26)),
+        Holiday(calendar=calendar, name="Independence Day", date=date(2026, 8, 15)),
+        Holiday(calendar=calendar, name="Diwali", date=date(2026, 10, 19), is_optional=True),
     ]
-    for h in holidays:
-        db.add(h)
+    db.add_all([calendar, *holidays])
     await db.flush()
 
     result = await AttendanceService.get_holidays(db, year=2026)
@@ -636,13 +585,6 @@ async def test_get_holidays_by_location(db, test_location):
         location_id=test_location["id"],
         is_active=True,
     )
-    db.add(cal_loc)
-    await db.flush()
-
-    db.add(Holiday(calendar_id=cal_loc.id, name="Ganesh Chaturthi",
-                   date=date(2026, 8, 27)))
-    await db.flush()
-
     # Global calendar (no location)
     cal_global = HolidayCalendar(
         name="India National 2026",
@@ -650,11 +592,12 @@ async def test_get_holidays_by_location(db, test_location):
         location_id=None,
         is_active=True,
     )
-    db.add(cal_global)
-    await db.flush()
-
-    db.add(Holiday(calendar_id=cal_global.id, name="Republic Day",
-                   date=date(2026, 1, 26)))
+    db.add_all([
+        cal_loc,
+        Holiday(calendar=cal_loc, name="Ganesh Chaturthi", date=date(2026, 8, 27)),
+        cal_global,
+        Holiday(calendar=cal_global, name="Republic Day", date=date(2026, 1, 26)),
+    ])
     await db.flush()
 
     result = await AttendanceService.get_holidays(
@@ -678,17 +621,9 @@ async def test_my_attendance_returns_records(db, test_employee):
     today = date.today()
 
     # Create a few attendance records
-    for i in range(3):
-        att = AttendanceRecord(
-            employee_id=test_employee["id"],
-            date=today - timedelta(days=i + 1),
-            status=AttendanceStatus.present,
-            total_work_minutes=510,
-            effective_work_minutes=450,
-            source="test",
-        )
-        db.add(att)
-    await db.flush()
+    await _bulk_seed_attendance(
+        db, test_employee["id"], [today - timedelta(days=i + 1) for i in range(3)],
+    )
 
     result = await AttendanceService.get_my_attendance(
         db,
@@ -704,9 +639,6 @@ async def test_my_attendance_returns_records(db, test_employee):
 
 async def test_my_attendance_date_range_validation(db, test_employee):
     """Date range > 90 days should raise ValidationException."""
-    from backend.common.exceptions import ValidationException
-    import pytest
-
     with pytest.raises(ValidationException):
         await AttendanceService.get_my_attendance(
             db,
@@ -721,49 +653,44 @@ async def test_my_attendance_date_range_validation(db, test_employee):
 # ═════════════════════════════════════════════════════════════════════
 
 
-async def test_calculate_hours_full_day():
-    """9 hours total → 8 effective (minus lunch) → present status."""
-    shift = ShiftPolicy(
-        name="Test",
-        start_time=time(9, 0),
-        end_time=time(18, 0),
-        grace_minutes=15,
-        half_day_minutes=240,
-        full_day_minutes=480,
-    )
-    first_in = datetime(2026, 2, 20, 9, 0, tzinfo=timezone.utc)
-    last_out = datetime(2026, 2, 20, 18, 0, tzinfo=timezone.utc)
-
-    total_h, effective_h, overtime_h, status = AttendanceService._calculate_hours(
-        first_in, last_out, shift,
-    )
-
-    assert total_h == 9.0
-    assert effective_h == 8.0  # 9 - 1 hour lunch
-    assert overtime_h == 0.0
-    assert status == AttendanceStatus.present
+# A plain 09:00–18:00 shift; never added to a session.
+_DAY_SHIFT = ShiftPolicy(
+    name="Test",
+    start_time=time(9, 0),
+    end_time=time(18, 0),
+    grace_minutes=15,
+    half_day_minutes=240,
+    full_day_minutes=480,
+)
 
 
-async def test_calculate_hours_half_day():
-    """5 hours total → 4 effective → half_day status."""
-    shift = ShiftPolicy(
-        name="Test",
-        start_time=time(9, 0),
-        end_time=time(18, 0),
-        grace_minutes=15,
-        half_day_minutes=240,
-        full_day_minutes=480,
-    )
-    first_in = datetime(2026, 2, 20, 9, 0, tzinfo=timezone.utc)
-    last_out = datetime(2026, 2, 20, 14, 0, tzinfo=timezone.utc)
+@pytest.mark.parametrize(
+    "in_h, out_h, total, effective, overtime, expected_status",
+    [
+        # 9 hours total → 8 effective (minus lunch) → present
+        (9, 18, 9.0, 8.0, 0.0, AttendanceStatus.present),
+        # 5 hours total → 4 effective → half_day
+        (9, 14, 5.0, 4.0, 0.0, AttendanceStatus.half_day),
+        # 11 hours → 10 effective, 2 over the 8-hour standard
+        (8, 19, 11.0, 10.0, 2.0, AttendanceStatus.present),
+        # 2 hours → 60 effective minutes (< half_day_minutes) → absent
+        (9, 11, 2.0, 1.0, 0.0, AttendanceStatus.absent),
+    ],
+    ids=["full_day", "half_day", "overtime", "very_short_day"],
+)
+def test_calculate_hours(in_h, out_h, total, effective, overtime, expected_status):
+    """Total/effective/overtime hours and status for a day shift."""
+    first_in = datetime(2026, 2, 20, in_h, 0, tzinfo=timezone.utc)
+    last_out = datetime(2026, 2, 20, out_h, 0, tzinfo=timezone.utc)
 
     total_h, effective_h, overtime_h, status = AttendanceService._calculate_hours(
-        first_in, last_out, shift,
+        first_in, last_out, _DAY_SHIFT,
     )
 
-    assert total_h == 5.0
-    assert effective_h == 4.0
-    assert status == AttendanceStatus.half_day
+    assert total_h == total
+    assert effective_h == effective  # 1 hour lunch is always deducted
+    assert overtime_h == overtime
+    assert status == expected_status
 
 
 # ═════════════════════════════════════════════════════════════════════
@@ -777,10 +704,8 @@ async def test_clock_in_sets_source_field(db, test_employee):
     resp = await AttendanceService.clock_in(db, test_employee["id"], source="biometric")
 
     record = (await db.execute(
-        select(AttendanceRecord).where(
-            AttendanceRecord.employee_id == test_employee["id"]
-        )
-    )).scalars().first()
+        _SEL_ATT_BY_EMP, {"eid": test_employee["id"]},
+    )).scalar_one_or_none()
     assert record.source == "biometric"
 
 
@@ -789,10 +714,8 @@ async def test_clock_entry_references_attendance_record(db, test_employee):
     resp = await AttendanceService.clock_in(db, test_employee["id"])
 
     entry = (await db.execute(
-        select(ClockEntry).where(
-            ClockEntry.employee_id == test_employee["id"]
-        )
-    )).scalars().first()
+        _SEL_ENTRY_BY_EMP, {"eid": test_employee["id"]},
+    )).scalar_one_or_none()
     assert entry is not None
     assert entry.attendance_record_id == resp.attendance_id
 
@@ -813,9 +736,6 @@ async def test_regularization_far_past_date(db, test_employee):
 
 async def test_regularization_future_date_rejected(db, test_employee):
     """Regularization for a future date should raise ValidationException."""
-    from backend.common.exceptions import ValidationException
-    import pytest
-
     future = date.today() + timedelta(days=5)
     with pytest.raises(ValidationException):
         await AttendanceService.submit_regularization(
@@ -862,9 +782,7 @@ async def test_multiple_clock_entries_same_day(db, test_employee):
     assert resp.attendance_id is not None
 
     entries = (await db.execute(
-        select(ClockEntry).where(
-            ClockEntry.employee_id == test_employee["id"]
-        )
+        _SEL_ENTRY_BY_EMP, {"eid": test_employee["id"]},
     )).scalars().all()
     assert len(entries) >= 2
 
@@ -874,8 +792,8 @@ async def test_attendance_record_preserves_date(db, test_employee):
     resp = await AttendanceService.clock_in(db, test_employee["id"])
 
     record = (await db.execute(
-        select(AttendanceRecord).where(AttendanceRecord.id == resp.attendance_id)
-    )).scalars().first()
+        _SEL_ATT_BY_ID, {"aid": resp.attendance_id},
+    )).scalar_one_or_none()
     assert record.date == date.today()
 
 
@@ -884,9 +802,7 @@ async def test_clock_in_creates_record_for_new_day(db, test_employee):
     resp = await AttendanceService.clock_in(db, test_employee["id"])
 
     records = (await db.execute(
-        select(AttendanceRecord).where(
-            AttendanceRecord.employee_id == test_employee["id"]
-        )
+        _SEL_ATT_BY_EMP, {"eid": test_employee["id"]},
     )).scalars().all()
     assert len(records) == 1
     assert records[0].date == date.today()
@@ -894,61 +810,11 @@ async def test_clock_in_creates_record_for_new_day(db, test_employee):
 
 async def test_clock_out_without_record_raises_validation(db, test_employee):
     """Clock-out when no record exists for today → ValidationException."""
-    from backend.common.exceptions import ValidationException, NotFoundException
-    import pytest
-
     with pytest.raises((ValidationException, NotFoundException)):
         await AttendanceService.clock_out(db, test_employee["id"])
 
 
-async def test_calculate_hours_overtime():
-    """Working 11 hours → 2 hours overtime."""
-    shift = ShiftPolicy(
-        name="Test",
-        start_time=time(9, 0),
-        end_time=time(18, 0),
-        grace_minutes=15,
-        half_day_minutes=240,
-        full_day_minutes=480,
-    )
-    first_in = datetime(2026, 2, 20, 8, 0, tzinfo=timezone.utc)
-    last_out = datetime(2026, 2, 20, 19, 0, tzinfo=timezone.utc)
-
-    total_h, effective_h, overtime_h, status = AttendanceService._calculate_hours(
-        first_in, last_out, shift,
-    )
-
-    assert total_h == 11.0
-    assert effective_h == 10.0  # 11 - 1 hour lunch
-    assert overtime_h == 2.0   # 10 effective - 8 standard = 2 overtime
-    assert status == AttendanceStatus.present
-
-
-async def test_calculate_hours_very_short_day():
-    """Working only 2 hours → less than half_day_minutes → absent."""
-    shift = ShiftPolicy(
-        name="Test",
-        start_time=time(9, 0),
-        end_time=time(18, 0),
-        grace_minutes=15,
-        half_day_minutes=240,
-        full_day_minutes=480,
-    )
-    first_in = datetime(2026, 2, 20, 9, 0, tzinfo=timezone.utc)
-    last_out = datetime(2026, 2, 20, 11, 0, tzinfo=timezone.utc)
-
-    total_h, effective_h, overtime_h, status = AttendanceService._calculate_hours(
-        first_in, last_out, shift,
-    )
-
-    assert total_h == 2.0
-    # 1 hour lunch is always deducted by the service
-    assert effective_h == 1.0
-    # With only 60 effective minutes (< 240), status should be absent
-    assert status == AttendanceStatus.absent
-
-
-async def test_night_shift_hours_calculation():
+def test_night_shift_hours_calculation():
     """Night shift crossing midnight — total 8h, effective 7h (minus lunch)."""
     shift = ShiftPolicy(
         name="Night Shift",
@@ -1003,23 +869,19 @@ async def test_holiday_optional_flag(db, test_location):
         location_id=test_location["id"],
         is_active=True,
     )
-    db.add(calendar)
-    await db.flush()
-
     mandatory = Holiday(
-        calendar_id=calendar.id,
+        calendar=calendar,
         name="Republic Day",
         date=date(2026, 1, 26),
         is_optional=False,
     )
     optional = Holiday(
-        calendar_id=calendar.id,
+        calendar=calendar,
         name="Holi",
         date=date(2026, 3, 14),
         is_optional=True,
     )
-    db.add(mandatory)
-    db.add(optional)
+    db.add_all([calendar, mandatory, optional])
     await db.flush()
 
     result = await AttendanceService.get_holidays(db, year=2026)
@@ -1038,8 +900,7 @@ async def test_weekly_off_policy_custom_days(db, test_employee):
     )
     await _assign_shift(db, test_employee["id"], shift.id, weekly_off.id)
 
-    from backend.leave.service import LeaveService as LS
-    offs = await LS._get_weekly_offs(db, test_employee["id"], date.today())
+    offs = await LeaveService._get_weekly_offs(db, test_employee["id"], date.today())
     assert offs == {4, 5}  # Friday=4, Saturday=5
 
 
@@ -1076,5 +937,5 @@ async def test_shift_assignment_effective_date_filtering(db, test_employee):
         .order_by(EmployeeShiftAssignment.effective_from.desc())
         .limit(1)
     )
-    assignment = result.scalars().first()
+    assignment = result.scalar_one_or_none()
     assert assignment.shift_policy_id == shift2.id
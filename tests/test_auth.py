@@ -10,8 +10,9 @@ from unittest.mock import AsyncMock, patch
 from jose import jwt
 from sqlalchemy import select
 
+from backend.auth.dependencies import hash_token
 from backend.auth.models import RoleAssignment, UserSession
-from backend.common.constants import PERMISSIONS, UserRole
+from backend.common.constants import PERMISSION_SETS, UserRole
 from backend.config import settings
 from tests.conftest import (
     TestSessionFactory,
@@ -119,7 +120,7 @@ async def test_jwt_expiry_check(client, db, test_employee):
         s = UserSession(
             id=uuid.uuid4(),
             employee_id=test_employee["id"],
-            token_hash=hashlib.sha256(expired_token.encode()).hexdigest(),
+            token_hash=hash_token(expired_token),
             expires_at=datetime.now(timezone.utc) - timedelta(hours=1),
             is_revoked=False,
             created_at=datetime.now(timezone.utc),
@@ -261,7 +262,7 @@ async def test_get_me_returns_current_user(
     assert data["display_name"] == f"{test_employee['first_name']} {test_employee['last_name']}"
     assert data["role"] == UserRole.employee.value
     assert isinstance(data["permissions"], list)
-    assert set(data["permissions"]) == set(PERMISSIONS[UserRole.employee])
+    assert frozenset(data["permissions"]) == PERMISSION_SETS[UserRole.employee]
 
 
 async def test_get_me_expired_token(client, db, test_employee):
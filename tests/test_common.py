@@ -10,7 +10,7 @@ import uuid
 from datetime import date, datetime, timezone
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.common.filters import apply_filters, apply_sorting, _get_column
@@ -26,27 +26,44 @@ from tests.conftest import (
 # ── Helpers ─────────────────────────────────────────────────────────
 
 
-async def _seed_location(db: AsyncSession, **kwargs) -> Location:
-    data = _make_location(**kwargs)
-    loc = Location(**data)
-    db.add(loc)
+def _new_location(**kwargs) -> Location:
+    return Location(**_make_location(**kwargs))
+
+
+def _new_department(location_id, **kwargs) -> Department:
+    return Department(**_make_department(location_id=location_id, **kwargs))
+
+
+def _new_employee(dept_id, loc_id, **kwargs) -> Employee:
+    return Employee(**_make_employee(department_id=dept_id, location_id=loc_id, **kwargs))
+
+
+async def _flush_all(db: AsyncSession, *objs) -> None:
+    """Add unsaved instances and write them in a single flush."""
+    db.add_all(objs)
     await db.flush()
+
+
+async def _count(db: AsyncSession, query) -> int:
+    """Row count of *query* without loading ORM instances."""
+    return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+
+async def _seed_location(db: AsyncSession, **kwargs) -> Location:
+    loc = _new_location(**kwargs)
+    await _flush_all(db, loc)
     return loc
 
 
 async def _seed_department(db: AsyncSession, location_id, **kwargs) -> Department:
-    data = _make_department(location_id=location_id, **kwargs)
-    dept = Department(**data)
-    db.add(dept)
-    await db.flush()
+    dept = _new_department(location_id, **kwargs)
+    await _flush_all(db, dept)
     return dept
 
 
 async def _seed_employee(db: AsyncSession, dept_id, loc_id, **kwargs) -> Employee:
-    data = _make_employee(department_id=dept_id, location_id=loc_id, **kwargs)
-    emp = Employee(**data)
-    db.add(emp)
-    await db.flush()
+    emp = _new_employee(dept_id, loc_id, **kwargs)
+    await _flush_all(db, emp)
     return emp
 
 
@@ -65,12 +82,10 @@ class TestApplyFilters:
         await _seed_employee(db, dept.id, loc.id, first_name="Alice", email="alice@creativefuel.io")
         await _seed_employee(db, dept.id, loc.id, first_name="Bob", email="bob@creativefuel.io")
 
-        query = select(Employee)
+        query = select(Employee.first_name)
         query = apply_filters(query, Employee, {"first_name": "Alice"})
-        result = await db.execute(query)
-        employees = result.scalars().all()
-        assert len(employees) == 1
-        assert employees[0].first_name == "Alice"
+        names = (await db.scalars(query)).all()
+        assert names == ["Alice"]
 
     async def test_filter_none_values_skipped(self, db: AsyncSession):
         """None values in filter dict are ignored."""
@@ -80,9 +95,7 @@ class TestApplyFilters:
 
         query = select(Employee)
         query = apply_filters(query, Employee, {"first_name": None, "is_active": True})
-        result = await db.execute(query)
-        employees = result.scalars().all()
-        assert len(employees) == 1
+        assert await _count(db, query) == 1
 
     async def test_filter_by_ilike(self, db: AsyncSession):
         """apply_filters with __ilike suffix for case-insensitive search."""
@@ -91,43 +104,31 @@ class TestApplyFilters:
         await _seed_employee(db, dept.id, loc.id, first_name="Alexander", email="alex@creativefuel.io")
         await _seed_employee(db, dept.id, loc.id, first_name="Bobby", email="bobby@creativefuel.io")
 
-        query = select(Employee)
+        query = select(Employee.first_name)
         query = apply_filters(query, Employee, {"first_name__ilike": "alex"})
-        result = await db.execute(query)
-        employees = result.scalars().all()
-        assert len(employees) == 1
-        assert employees[0].first_name == "Alexander"
+        names = (await db.scalars(query)).all()
+        assert names == ["Alexander"]
 
     async def test_filter_by_from_to_range(self, db: AsyncSession):
         """apply_filters with __from and __to for date range."""
-        loc = await _seed_location(db)
-        dept = await _seed_department(db, loc.id)
+        loc = _new_location()
+        dept = _new_department(loc.id)
 
-        emp1_data = _make_employee(department_id=dept.id, location_id=loc.id, email="e1@creativefuel.io", first_name="E1")
-        emp1 = Employee(**emp1_data)
+        emp1 = _new_employee(dept.id, loc.id, email="e1@creativefuel.io", first_name="E1")
         emp1.date_of_joining = date(2024, 1, 1)
-        db.add(emp1)
-
-        emp2_data = _make_employee(department_id=dept.id, location_id=loc.id, email="e2@creativefuel.io", first_name="E2")
-        emp2 = Employee(**emp2_data)
+        emp2 = _new_employee(dept.id, loc.id, email="e2@creativefuel.io", first_name="E2")
         emp2.date_of_joining = date(2025, 6, 1)
-        db.add(emp2)
-
-        emp3_data = _make_employee(department_id=dept.id, location_id=loc.id, email="e3@creativefuel.io", first_name="E3")
-        emp3 = Employee(**emp3_data)
+        emp3 = _new_employee(dept.id, loc.id, email="e3@creativefuel.io", first_name="E3")
         emp3.date_of_joining = date(2026, 1, 1)
-        db.add(emp3)
-        await db.flush()
+        await _flush_all(db, loc, dept, emp1, emp2, emp3)
 
-        query = select(Employee)
+        query = select(Employee.first_name)
         query = apply_filters(query, Employee, {
             "date_of_joining__from": date(2025, 1, 1),
             "date_of_joining__to": date(2025, 12, 31),
         })
-        result = await db.execute(query)
-        employees = result.scalars().all()
-        assert len(employees) == 1
-        assert employees[0].first_name == "E2"
+        names = (await db.scalars(query)).all()
+        assert names == ["E2"]
 
     async def test_filter_by_in(self, db: AsyncSession):
         """apply_filters with __in suffix for IN clause."""
@@ -137,15 +138,12 @@ class TestApplyFilters:
         await _seed_employee(db, dept.id, loc.id, first_name="Bob", email="b@creativefuel.io")
         await _seed_employee(db, dept.id, loc.id, first_name="Charlie", email="c@creativefuel.io")
 
-        query = select(Employee)
+        query = select(Employee.first_name)
         query = apply_filters(query, Employee, {
             "first_name__in": ["Alice", "Charlie"],
         })
-        result = await db.execute(query)
-        employees = result.scalars().all()
-        assert len(employees) == 2
-        names = {e.first_name for e in employees}
-        assert names == {"Alice", "Charlie"}
+        names = (await db.scalars(query)).all()
+        assert sorted(names) == ["Alice", "Charlie"]
 
     async def test_filter_nonexistent_column_ignored(self, db: AsyncSession):
         """Filtering on a non-existent column is silently ignored."""
@@ -155,8 +153,7 @@ class TestApplyFilters:
 
         query = select(Employee)
         query = apply_filters(query, Employee, {"nonexistent_field": "value"})
-        result = await db.execute(query)
-        assert len(result.scalars().all()) == 1  # No error, no filter applied
+        assert await _count(db, query) == 1  # No error, no filter applied
 
 
 class TestApplySorting:
@@ -229,14 +226,12 @@ class TestPagination:
 
     async def test_paginate_with_sort(self, db: AsyncSession):
         """paginate() with sort parameter applies ORDER BY."""
-        loc = await _seed_location(db)
-        dept = await _seed_department(db, loc.id)
-
-        for i in range(5):
-            await _seed_employee(
-                db, dept.id, loc.id,
-                first_name=f"P{i}", email=f"p{i}@creativefuel.io",
-            )
+        loc = _new_location()
+        dept = _new_department(loc.id)
+        await _flush_all(db, loc, dept, *(
+            _new_employee(dept.id, loc.id, first_name=f"P{i}", email=f"p{i}@creativefuel.io")
+            for i in range(5)
+        ))
 
         query = select(Employee)
         params = PaginationParams(page=1, page_size=3, sort="-first_name")
@@ -247,14 +242,12 @@ class TestPagination:
 
     async def test_paginate_page_2(self, db: AsyncSession):
         """paginate() page 2 returns remaining items."""
-        loc = await _seed_location(db)
-        dept = await _seed_department(db, loc.id)
-
-        for i in range(5):
-            await _seed_employee(
-                db, dept.id, loc.id,
-                first_name=f"Q{i}", email=f"q{i}@creativefuel.io",
-            )
+        loc = _new_location()
+        dept = _new_department(loc.id)
+        await _flush_all(db, loc, dept, *(
+            _new_employee(dept.id, loc.id, first_name=f"Q{i}", email=f"q{i}@creativefuel.io")
+            for i in range(5)
+        ))
 
         query = select(Employee)
         params = PaginationParams(page=2, page_size=3, sort=None)